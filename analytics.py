@@ -0,0 +1,297 @@
+"""Analytics across completed auctions.
+
+Every sale from any number of auctions goes into one columnar table (one
+row per sold player), loaded either from auction journals or from results
+files saved by the export. Journals are read directly: the snapshot's sales
+plus the hammer events after it, joined with the saved player pool, without
+replaying the auctions. All figures are then computed with vectorized
+group-bys over that table:
+
+- value for money: each player's rating (role-appropriate average plus
+  experience, as a percentile within the role) against the percentile of
+  the price paid
+- spend by role and by country
+- price inflation in each band of the increment ladder
+- team strategies: how each team spread its purse, and how each kind of
+  strategy fared
+
+    python -m analytics --journals auctions
+    python -m analytics --exports results_1.parquet results_2.csv
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from auction_engine import INCREMENT_LADDER
+from journal import JOURNAL_DIR, completed_auctions
+
+SALE_COLUMNS = ['auction', 'team_id', 'team', 'player', 'role', 'country', 'base_price', 'price', 'batting_avg',
+                'bowling_avg', 'matches', 'purse']
+CATEGORY_COLUMNS = ['auction', 'team_id', 'team', 'role', 'country']
+# Results export column -> sale column
+EXPORT_COLUMNS = {'Team': 'team', 'Player': 'player', 'Role': 'role', 'Country': 'country',
+                  'Base Price (crores)': 'base_price', 'Price (crores)': 'price', 'Batting Avg': 'batting_avg',
+                  'Bowling Avg': 'bowling_avg', 'Matches': 'matches'}
+BATTING_ROLES = ['Batsman', 'Wicket-keeper']
+BOWLING_ROLES = ['Bowler']
+EXPERIENCE_WEIGHT = 0.2  # Share of a player's rating that comes from matches played
+STAR_SHARE = 0.5  # Teams spending at least this much of their total on their top 3 buys are 'Star-heavy'
+ROLE_SHARE = 0.4  # ...otherwise at least this much on one role makes them '<role>-heavy'
+
+
+class AnalyticsError(ValueError):
+    """Raised when auction results cannot be read."""
+
+
+def load_journals(directories):
+    """Sales table for the auctions journaled in `directories`."""
+    columns = {name: [] for name in SALE_COLUMNS}
+    for directory in directories:
+        try:
+            _read_journal(directory, columns)
+        except (OSError, ValueError, KeyError) as e:
+            raise AnalyticsError(f"Cannot read auction results in {directory}: {e}") from e
+    return _sales_frame({name: np.concatenate(parts) if parts else [] for name, parts in columns.items()})
+
+
+def load_auctions(root=JOURNAL_DIR):
+    """Sales table for every completed auction journaled under `root`."""
+    return load_journals(completed_auctions(root))
+
+
+def _read_journal(directory, columns):
+    with open(os.path.join(directory, 'auction.json')) as f:
+        setup = json.load(f)
+
+    sales = {}  # player id -> (team id, price)
+    offset = 0
+    snapshot_path = os.path.join(directory, 'snapshot.json')
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path) as f:
+            snapshot = json.load(f)
+        sales = {int(player_id): sale for player_id, sale in snapshot['state']['sales'].items()}
+        offset = snapshot['offset']
+    with open(os.path.join(directory, 'journal.jsonl'), 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if b'"type":"hammer"' not in line:
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                break  # A torn last line; everything before it is intact
+            sales[event['player']] = (event['team'], event['price'])
+    if not sales:
+        return
+
+    teams = {t['id']: t for t in setup['teams']}
+    ids = np.fromiter(sales, dtype=np.int64, count=len(sales))
+    team_ids = [team_id for team_id, _ in sales.values()]
+    with np.load(os.path.join(directory, 'players.npz')) as players:
+        roles, countries = players['roles'].astype(object), players['countries'].astype(object)
+        columns['player'].append(players['name'][ids].astype(object))
+        columns['role'].append(roles[players['role'][ids]])
+        columns['country'].append(countries[players['country'][ids]])
+        columns['base_price'].append(players['base_price'][ids])
+        columns['batting_avg'].append(players['batting_avg'][ids].astype(np.float64))
+        columns['bowling_avg'].append(players['bowling_avg'][ids].astype(np.float64))
+        columns['matches'].append(players['matches_played'][ids].astype(np.int64))
+    columns['auction'].append(np.full(len(ids), setup['id'], dtype=object))
+    columns['team_id'].append(np.array(team_ids, dtype=object))
+    columns['team'].append(np.array([teams[team_id]['name'] for team_id in team_ids], dtype=object))
+    columns['price'].append(np.fromiter((price for _, price in sales.values()), dtype=np.float64, count=len(ids)))
+    columns['purse'].append(np.array([teams[team_id]['purse'] for team_id in team_ids], dtype=np.float64))
+
+
+def load_exports(paths):
+    """Sales table from results files (CSV or Parquet) saved by the export, one auction per file.
+
+    Exports only name the teams, so the name stands in for the team id:
+    teams sharing a name within one file are counted as one.
+    """
+    frames = []
+    for path in paths:
+        try:
+            frame = pd.read_parquet(path) if path.endswith('.parquet') else pd.read_csv(path)
+        except (OSError, ValueError) as e:
+            raise AnalyticsError(f"Cannot read {path}: {e}") from e
+        missing = {'Team', 'Player', 'Role', 'Price (crores)'} - set(frame.columns)
+        if missing:
+            raise AnalyticsError(f"{path} is not an auction results file: no {', '.join(sorted(missing))} column")
+        frame = frame.rename(columns=EXPORT_COLUMNS).reindex(columns=SALE_COLUMNS)
+        frame['auction'] = path
+        frame['team_id'] = frame['team']
+        frames.append(frame)
+    if not frames:
+        return _sales_frame({name: [] for name in SALE_COLUMNS})
+    return _sales_frame({name: np.concatenate([f[name].to_numpy() for f in frames]) for name in SALE_COLUMNS})
+
+
+def _sales_frame(columns):
+    frame = pd.DataFrame(columns, columns=SALE_COLUMNS)
+    for name in CATEGORY_COLUMNS:
+        frame[name] = frame[name].astype('category')
+    for name in ['base_price', 'price', 'batting_avg', 'bowling_avg', 'matches', 'purse']:
+        frame[name] = frame[name].astype(np.float64)
+    return frame
+
+
+def value_for_money(sales):
+    """`sales` with each player's `rating`, `price_rank` and `value` (rating minus price rank).
+
+    Ratings and price ranks are percentiles within the player's role, so a
+    value above 0 means a better player than the price paid would suggest.
+    """
+    by_role = sales.groupby('role', observed=True)
+    batting = by_role['batting_avg'].rank(pct=True)
+    bowling = by_role['bowling_avg'].rank(pct=True, ascending=False)  # A lower bowling average is better
+    role = sales['role'].astype(object)
+    performance = np.select([role.isin(BATTING_ROLES), role.isin(BOWLING_ROLES)], [batting, bowling],
+                            default=(batting + bowling) / 2)
+    experience = by_role['matches'].rank(pct=True)
+    rated = sales.copy()
+    rated['rating'] = (1 - EXPERIENCE_WEIGHT) * performance + EXPERIENCE_WEIGHT * experience
+    rated['price_rank'] = by_role['price'].rank(pct=True)
+    rated['value'] = rated['rating'] - rated['price_rank']
+    return rated
+
+
+def spend_by(sales, column):
+    """Players bought, total and average price, and share of all spend, per value of `column`."""
+    grouped = sales.groupby(column, observed=True)['price']
+    frame = pd.DataFrame({'players': grouped.size(), 'spent': grouped.sum(), 'avg_price': grouped.mean()})
+    frame['share'] = frame['spent'] / frame['spent'].sum()
+    frame['spent_per_auction'] = frame['spent'] / max(1, sales['auction'].nunique())
+    return frame.sort_values('spent', ascending=False)
+
+
+def ladder_raises(base_price, price, ladder=INCREMENT_LADDER):
+    """Raises it took to go from each base price to its sale price: `ladder_steps` over arrays."""
+    current = np.round(np.asarray(base_price, dtype=np.float64) * 100).astype(np.int64)
+    target = np.round(np.asarray(price, dtype=np.float64) * 100).astype(np.int64)
+    raises = np.zeros(len(current), dtype=np.int64)
+    for upper, step in ladder:
+        step = round(step * 100)
+        reachable = np.maximum(0, target - current) // step
+        if upper is None:
+            return raises + reachable
+        upper = round(upper * 100)
+        # Raises taken in this band: up to the first one landing at or above its upper bound
+        to_upper = np.where(current < upper, -(-(upper - current) // step), 0)
+        taken = np.minimum(to_upper, reachable)
+        raises += taken
+        current = current + taken * step
+    return raises
+
+
+def band_labels(ladder=INCREMENT_LADDER):
+    labels, lower = [], 0
+    for upper, step in ladder:
+        labels.append(f"₹{lower}-{upper} cr (+{step})" if upper is not None else f"₹{lower}+ cr (+{step})")
+        lower = upper
+    return labels
+
+
+def inflation_by_band(sales, ladder=INCREMENT_LADDER):
+    """Per increment band of the sale price: sales, average price, markup over base price and raises.
+
+    Sales without a base price (older exports) are left out.
+    """
+    sales = sales[sales['base_price'].notna()]
+    price, base = sales['price'].to_numpy(), sales['base_price'].to_numpy()
+    uppers = [upper for upper, _ in ladder if upper is not None]
+    labels = band_labels(ladder)
+    frame = pd.DataFrame({
+        'band': pd.Categorical.from_codes(np.searchsorted(uppers, price, side='right'), labels),
+        'price': price,
+        'markup': price / base - 1,
+        'raises': ladder_raises(base, price, ladder),
+    })
+    grouped = frame.groupby('band', observed=False)
+    return pd.DataFrame({
+        'sales': grouped.size(),
+        'avg_price': grouped['price'].mean(),
+        'median_markup': grouped['markup'].median(),
+        'avg_markup': grouped['markup'].mean(),
+        'avg_raises': grouped['raises'].mean(),
+    })
+
+
+def team_strategies(sales):
+    """One row per team per auction: what it bought, how it spread its purse, and its strategy.
+
+    Indexed by (auction, team id), since team names need not be unique.
+    Pass the output of `value_for_money` to get each team's average value too.
+    """
+    sales = sales.sort_values(['auction', 'team_id', 'price'], ascending=[True, True, False], kind='stable')
+    keys = ['auction', 'team_id']
+    grouped = sales.groupby(keys, observed=True)
+    top3 = sales['price'].where(grouped.cumcount() < 3, 0.0).groupby([sales['auction'], sales['team_id']],
+                                                                      observed=True).sum()
+    teams = pd.DataFrame({
+        'team': grouped['team'].first(),
+        'players': grouped.size(),
+        'spent': grouped['price'].sum(),
+        'avg_price': grouped['price'].mean(),
+        'purse_used': grouped['price'].sum() / grouped['purse'].first(),
+        'top3_share': top3 / grouped['price'].sum(),
+    })
+    if 'value' in sales:
+        teams['value'] = grouped['value'].mean()
+
+    role_spend = sales.pivot_table(index=keys, columns='role', values='price', aggfunc='sum', fill_value=0.0,
+                                   observed=True)
+    role_share = role_spend.div(role_spend.sum(axis=1), axis=0)
+    teams = teams.join(role_share.add_suffix(' share'))
+    top_role = role_share.idxmax(axis=1).astype(object)
+    teams['strategy'] = np.where(teams['top3_share'] >= STAR_SHARE, 'Star-heavy',
+                                 np.where(role_share.max(axis=1) >= ROLE_SHARE, top_role + '-heavy', 'Balanced'))
+    return teams
+
+
+def strategy_summary(teams):
+    """How each kind of team strategy fared on average."""
+    grouped = teams.groupby('strategy')
+    summary = pd.DataFrame({
+        'teams': grouped.size(),
+        'avg_spent': grouped['spent'].mean(),
+        'avg_players': grouped['players'].mean(),
+        'avg_top3_share': grouped['top3_share'].mean(),
+    })
+    if 'value' in teams:
+        summary['avg_value'] = grouped['value'].mean()
+    return summary.sort_values('teams', ascending=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--journals', default=JOURNAL_DIR, help="Directory of auction journals")
+    source.add_argument('--exports', nargs='+', help="Results files (CSV or Parquet) saved by the export")
+    args = parser.parse_args()
+
+    sales = load_exports(args.exports) if args.exports else load_auctions(args.journals)
+    if sales.empty:
+        print("No completed auctions found.")
+        return
+    rated = value_for_money(sales)
+    pd.set_option('display.width', 160)
+    print(f"{sales['auction'].nunique()} auctions, {len(sales)} players sold, ₹{sales['price'].sum():,.2f} crores spent")
+    print("\nSpend by role:")
+    print(spend_by(sales, 'role').round(2).to_string())
+    print("\nSpend by country:")
+    print(spend_by(sales, 'country').round(2).to_string())
+    print("\nPrice inflation by increment band:")
+    print(inflation_by_band(sales).round(2).to_string())
+    print("\nTeam strategies:")
+    print(strategy_summary(team_strategies(rated)).round(2).to_string())
+    print("\nBest value for money:")
+    print(rated.nlargest(10, 'value')[['auction', 'team', 'player', 'role', 'price', 'rating', 'value']]
+          .round(2).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
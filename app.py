@@ -1,9 +1,22 @@
 import streamlit as st
 import pandas as pd
-import random
-import time
-import uuid
+import json
+import math
 import os
+import uuid
+
+from analytics import (AnalyticsError, inflation_by_band, load_journals, spend_by, strategy_summary, team_strategies,
+                       value_for_money)
+from auction_engine import AuctionEngine, AuctionError, cheapest_bid
+from export import EXPORT_DIR, build_export, save_export
+from journal import JOURNAL_DIR, AuctionJournal, JournalError, completed_auctions, incomplete_auctions, recover
+from player_import import PlayerImportError, import_players
+from players import PLAYER_COUNTRIES, PLAYER_ROLES, cached_players
+from profiling import RerunProfiler
+from render_cache import render_cache
+from rooms import StaleActionError, rooms
+from simulator import simulate
+from squad_rules import SquadRules, SquadRulesError
 
 # Set page config
 st.set_page_config(
@@ -15,49 +28,139 @@ st.set_page_config(
 # Initialize session state variables if they don't exist
 if 'app_stage' not in st.session_state:
     st.session_state.app_stage = 'setup'
-if 'teams' not in st.session_state:
-    st.session_state.teams = []
-if 'players' not in st.session_state:
-    st.session_state.players = []
-if 'current_player' not in st.session_state:
-    st.session_state.current_player = None
-if 'current_bid' not in st.session_state:
-    st.session_state.current_bid = 0
-if 'current_team' not in st.session_state:
-    st.session_state.current_team = None
+if 'engine' not in st.session_state:
+    st.session_state.engine = None
 if 'auction_complete' not in st.session_state:
     st.session_state.auction_complete = False
-if 'remaining_players' not in st.session_state:
-    st.session_state.remaining_players = []
-
-# Sample player data (you could load this from a CSV or database)
-def generate_sample_players():
-    player_roles = ['Batsman', 'Bowler', 'All-rounder', 'Wicket-keeper']
-    player_countries = ['India', 'Australia', 'England', 'New Zealand', 'South Africa', 'West Indies', 'Pakistan', 'Sri Lanka']
-    
-    players = []
-    # Generate sample player data
-    for i in range(100):
-        player = {
-            'id': str(uuid.uuid4()),
-            'name': f"Player {i+1}",
-            'role': random.choice(player_roles),
-            'country': random.choice(player_countries),
-            'base_price': random.choice([0.5, 0.75, 1.0, 1.5, 2.0]),  # Base price in crores
-            'stats': {
-                'batting_avg': round(random.uniform(20, 60), 1),
-                'bowling_avg': round(random.uniform(18, 40), 1),
-                'matches_played': random.randint(10, 200)
-            },
-            'status': 'unsold'
-        }
-        players.append(player)
-    return players
+if 'notifications' not in st.session_state:
+    st.session_state.notifications = []
+if 'room' not in st.session_state:
+    st.session_state.room = None
+if 'team_id' not in st.session_state:
+    st.session_state.team_id = None  # Set when this session bids for a single team
+if 'profiler' not in st.session_state:
+    st.session_state.profiler = RerunProfiler()
+
+# How long a live page waits on its room before touching the page again (so clicks are not held up)
+LIVE_WAIT = 0.5
+MAX_TEAMS = 500
+TEAM_FORM_LIMIT = 10  # Above this, teams are set up in one editable table instead of a form field each
+TEAMS_PER_PAGE = 10
+POOL_PAGE_SIZE = 25
+# Label -> indexed column, for the pool browser's range sliders and sorting
+POOL_COLUMNS = {'Base Price': 'base_price', 'Batting Avg': 'batting_avg', 'Bowling Avg': 'bowling_avg',
+                'Matches': 'matches_played'}
+# Lot sets offered when an auction is run in sets, one row per set
+DEFAULT_LOT_SETS = pd.DataFrame({
+    'Set': ['Marquee', 'Batsmen', 'All-rounders', 'Wicket-keepers', 'Bowlers'],
+    'Roles': ['', 'Batsman', 'All-rounder', 'Wicket-keeper', 'Bowler'],
+    'Countries': [''] * 5,
+    'Min Base Price': [2.0] + [math.nan] * 4,
+    'Max Base Price': [math.nan] * 5,
+    'Min Batting Avg': [math.nan] * 5,
+    'Max Bowling Avg': [math.nan] * 5,
+    'Min Matches': [math.nan] * 5,
+})
 
 # Initialize or change app stage
 def set_stage(stage):
     st.session_state.app_stage = stage
 
+def begin(section, idle=False):
+    """Start timing the next section of this rerun."""
+    st.session_state.profiler.begin(section, idle)
+
+def action(name):
+    st.session_state.profiler.mark_action(name)
+
+def rerun():
+    """Ask Streamlit for another run, counted against the action that caused it."""
+    st.session_state.profiler.chain()
+    st.experimental_rerun()
+
+def notify(message, icon=None):
+    """Queue a confirmation to be shown as a toast on the next render."""
+    st.session_state.notifications.append((message, icon))
+
+def show_notifications():
+    while st.session_state.notifications:
+        message, icon = st.session_state.notifications.pop(0)
+        st.toast(message, icon=icon)
+
+def load_players(source, player_file, sample_size=100, seed=0):
+    """Build the player pool for a new auction, or return None after showing an error."""
+    if source == "Sample players":
+        # Loaded from a snapshot when this size and seed were used before
+        with st.spinner("Generating players..."):
+            return cached_players(sample_size, seed)
+    if not player_file:
+        st.error("Choose a player file to import.")
+        return None
+    
+    try:
+        with st.spinner("Importing players..."):
+            # Files on the server are memory-mapped rather than read into a buffer first
+            players, report = import_players(player_file, memory_map=isinstance(player_file, str))
+    except (PlayerImportError, OSError) as e:
+        st.error(str(e))
+        return None
+    
+    st.session_state.import_report = report
+    return players
+
+def join_room(room):
+    st.session_state.room = room
+    st.session_state.engine = room.engine
+    # Keep the auction id in the URL so a refresh or a restarted server picks the auction back up
+    st.query_params['auction'] = room.id
+    set_stage('auction')
+
+def resume_auction(directory):
+    """Join the live room for an auction, rebuilding it from its journal if needed.
+
+    Returns False after showing an error if the journal cannot be read.
+    """
+    try:
+        room = rooms.get_or_open(os.path.basename(directory), lambda: recover(directory))
+    except JournalError as e:
+        st.error(str(e))
+        return False
+    join_room(room)
+    return True
+
+def resume_panel():
+    interrupted = incomplete_auctions()
+    if not interrupted:
+        return
+    with st.expander(f"Resume an interrupted auction ({len(interrupted)})"):
+        labels = {auction_label(directory): directory for directory in interrupted}
+        label = st.selectbox("Auction", list(labels))
+        if st.button("Resume Auction"):
+            action('resume auction')
+            if resume_auction(labels[label]):
+                rerun()
+
+def auction_label(directory):
+    try:
+        with open(os.path.join(directory, 'auction.json')) as f:
+            setup = json.load(f)
+    except (OSError, ValueError):
+        return os.path.basename(directory)
+    names = [t['name'] for t in setup['teams'][:3]]
+    if len(setup['teams']) > 3:
+        names.append(f"{len(setup['teams']) - 3} more")
+    return f"{', '.join(names)} ({setup['id'][:8]})"
+
+def new_team(name, purse):
+    return {
+        'id': str(uuid.uuid4()),
+        'name': name,
+        'purse': purse,
+        'original_purse': purse,
+        'players': [],
+        'can_bid': True
+    }
+
 def setup_teams():
     st.title("🏏 Cricket Player Auction Simulator")
     
@@ -67,73 +170,453 @@ def setup_teams():
     Each team will have a purse amount to spend on players.
     """)
     
-    num_teams = st.number_input("Number of Teams", min_value=2, max_value=10, value=3, step=1)
+    begin('resume panel')
+    resume_panel()
+    
+    begin('setup form')
+    num_teams = st.number_input("Number of Teams", min_value=2, max_value=MAX_TEAMS, value=3, step=1)
     default_purse = st.number_input("Default Purse Amount per Team (in crores)", min_value=5.0, max_value=100.0, value=90.0, step=0.5)
     
+    player_source = st.radio("Player Pool", ["Sample players", "Upload a file", "File on server"], horizontal=True)
+    player_file = None
+    sample_size, player_seed = 100, 0
+    if player_source == "Sample players":
+        col1, col2 = st.columns(2)
+        with col1:
+            sample_size = st.number_input("Sample Players", min_value=10, max_value=5_000_000, value=100, step=100)
+        with col2:
+            player_seed = st.number_input("Player Seed", min_value=0, value=0, step=1,
+                                          help="The same seed and number of players always give the same pool")
+    elif player_source == "Upload a file":
+        player_file = st.file_uploader("Player file (CSV or Parquet)", type=['csv', 'parquet'])
+    elif player_source == "File on server":
+        player_file = st.text_input("Path to player file (CSV or Parquet)").strip()
+    
+    lot_order = st.radio("Lot Order", ["Highest base price first", "In sets"], horizontal=True,
+                         help="In sets, each set is auctioned in turn; players no set picks go last")
+    
     with st.form("team_setup_form"):
         teams = []
-        cols = st.columns(2)
-        
-        for i in range(num_teams):
-            with cols[i % 2]:
-                st.subheader(f"Team {i+1}")
-                name = st.text_input(f"Team Name", value=f"Team {i+1}", key=f"team_name_{i}")
-                purse = st.number_input(f"Purse Amount (in crores)", min_value=5.0, max_value=100.0, value=default_purse, step=0.5, key=f"team_purse_{i}")
-                
-                team = {
-                    'id': str(uuid.uuid4()),
-                    'name': name,
-                    'purse': purse,
-                    'original_purse': purse,
-                    'players': [],
-                    'can_bid': True
-                }
-                teams.append(team)
+        bad_rows = []  # Team table rows left without a name or a valid purse
+        if num_teams <= TEAM_FORM_LIMIT:
+            cols = st.columns(2)
+            
+            for i in range(num_teams):
+                with cols[i % 2]:
+                    st.subheader(f"Team {i+1}")
+                    name = st.text_input(f"Team Name", value=f"Team {i+1}", key=f"team_name_{i}")
+                    purse = st.number_input(f"Purse Amount (in crores)", min_value=5.0, max_value=100.0, value=default_purse, step=0.5, key=f"team_purse_{i}")
+                    teams.append(new_team(name, purse))
+        else:
+            # One table widget instead of two widgets per team keeps large leagues quick to set up
+            st.subheader("Teams")
+            edited = st.data_editor(
+                pd.DataFrame({
+                    'Team Name': [f"Team {i+1}" for i in range(num_teams)],
+                    'Purse Amount (in crores)': [default_purse] * num_teams,
+                }),
+                column_config={
+                    'Team Name': st.column_config.TextColumn(required=True),
+                    'Purse Amount (in crores)': st.column_config.NumberColumn(min_value=5.0, max_value=100.0, step=0.5,
+                                                                              required=True),
+                },
+                hide_index=True,
+                use_container_width=True,
+                key="team_table",
+            )
+            for row, (name, purse) in enumerate(zip(edited['Team Name'], edited['Purse Amount (in crores)']), start=1):
+                # A cleared cell comes back empty (None or NaN), which would make a team nobody can limit
+                if pd.isna(name) or not str(name).strip() or pd.isna(purse) or not 5.0 <= purse <= 100.0:
+                    bad_rows.append(row)
+                else:
+                    teams.append(new_team(str(name), float(purse)))
         
         max_squad_size = st.number_input("Maximum Squad Size per Team", min_value=11, max_value=25, value=15, step=1)
+        rule_inputs = squad_rules_inputs()
+        
+        lot_table = None
+        if lot_order == "In sets":
+            st.subheader("Lot Sets")
+            st.caption("Roles and countries are comma separated; leave a cell empty to not filter on it.")
+            lot_table = st.data_editor(DEFAULT_LOT_SETS, num_rows="dynamic", hide_index=True,
+                                       use_container_width=True, key="lot_set_table")
         
         submit_button = st.form_submit_button("Start Auction")
         
         if submit_button:
-            st.session_state.teams = teams
-            st.session_state.max_squad_size = max_squad_size
-            st.session_state.players = generate_sample_players()
-            st.session_state.remaining_players = st.session_state.players.copy()
-            set_stage('auction')
-            st.experimental_rerun()
+            action('start auction')
+            if bad_rows:
+                st.error(f"Every team needs a name and a purse of ₹5 to ₹100 crores; check row(s) "
+                         f"{', '.join(map(str, bad_rows))} of the team table")
+                return
+            rules = squad_rules(max_squad_size, **rule_inputs)
+            if rules is None:
+                return
+            begin('load players')
+            players = load_players(player_source, player_file, int(sample_size), int(player_seed))
+            if players is not None:
+                min_spend = rules.min_spend(cheapest_bid(players.column('base_price')))
+                short = [team['name'] for team in teams if team['purse'] < min_spend]
+                if short:
+                    st.error(f"A legal squad needs at least ₹{min_spend} crores; too little purse: {', '.join(short)}")
+                    return
+                begin('start auction')
+                lot_sets = lot_sets_from_table(lot_table) if lot_table is not None else None
+                engine = AuctionEngine(teams, players, rules=rules, lot_sets=lot_sets)
+                try:
+                    journal = AuctionJournal.create(engine)
+                except OSError as e:
+                    st.error(f"Could not start the auction journal: {e}")
+                else:
+                    join_room(rooms.open(engine, journal))
+                    rerun()
+    
+    begin('simulation panel')
+    simulation_panel(num_teams, default_purse)
+
+def lot_sets_from_table(table):
+    """Lot set definitions for the engine from the setup table's rows."""
+    def names(cell):
+        if pd.isna(cell):
+            return None
+        return [name.strip() for name in str(cell).split(',') if name.strip()] or None
+    
+    def value(cell):
+        return None if pd.isna(cell) else float(cell)
+    
+    lot_sets = []
+    for row in table.to_dict('records'):
+        if pd.isna(row['Set']) or not str(row['Set']).strip():
+            continue
+        filters = {
+            'roles': names(row['Roles']),
+            'countries': names(row['Countries']),
+            'base_price': [value(row['Min Base Price']), value(row['Max Base Price'])],
+            'batting_avg': [value(row['Min Batting Avg']), None],
+            'bowling_avg': [None, value(row['Max Bowling Avg'])],
+            'matches_played': [value(row['Min Matches']), None],
+        }
+        lot_sets.append({'name': str(row['Set']).strip(), 'filters': filters})
+    return lot_sets
+
+def squad_rules_inputs():
+    with st.expander("Squad Rules"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            min_squad_size = st.number_input("Minimum Squad Size", min_value=0, max_value=25, value=0, step=1)
+        with col2:
+            home_country = st.selectbox("Home Country", PLAYER_COUNTRIES)
+        with col3:
+            max_overseas = st.number_input("Maximum Overseas Players", min_value=0, max_value=25, value=25, step=1)
+        
+        st.caption("Players per role; a maximum at or above the squad size means no limit.")
+        quotas = {}
+        for col, role in zip(st.columns(len(PLAYER_ROLES)), PLAYER_ROLES):
+            with col:
+                low = st.number_input(f"Min {role}", min_value=0, max_value=25, value=0, step=1, key=f"role_min_{role}")
+                high = st.number_input(f"Max {role}", min_value=0, max_value=25, value=25, step=1, key=f"role_max_{role}")
+            quotas[role] = (low, high)
+    return {'min_squad_size': min_squad_size, 'home_country': home_country, 'max_overseas': max_overseas,
+            'quotas': quotas}
+
+def squad_rules(max_squad_size, min_squad_size, home_country, max_overseas, quotas):
+    """SquadRules from the setup form, or None after showing why they don't add up."""
+    role_quotas = {role: (low, high if high < max_squad_size else None)
+                   for role, (low, high) in quotas.items() if low or high < max_squad_size}
+    try:
+        return SquadRules(max_squad_size, min_squad_size, role_quotas,
+                          max_overseas if max_overseas < max_squad_size else None, home_country)
+    except SquadRulesError as e:
+        st.error(f"Check the squad rules: {e}")
+        return None
+
+def simulation_panel(num_teams, default_purse):
+    # Try out purse and squad settings on thousands of automated auctions before the real event
+    with st.expander("Simulate auctions with automated bidders"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            runs = st.number_input("Auctions to simulate", min_value=10, max_value=100000, value=500, step=100)
+        with col2:
+            squad_size = st.number_input("Squad size", min_value=11, max_value=25, value=15, step=1, key="sim_squad_size")
+        with col3:
+            seed = st.number_input("Seed", min_value=0, value=0, step=1)
+        
+        if st.button("Run Simulation"):
+            action('simulate')
+            teams = [(f"Team {i+1}", default_purse) for i in range(num_teams)]
+            with st.spinner(f"Simulating {runs} auctions..."):
+                result = simulate(runs, teams, max_squad_size=squad_size, seed=seed)
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Unsold Rate", f"{result['unsold_rate']['mean']:.1%}")
+            with col2:
+                st.metric("Avg. Purse Left", f"₹{result['purse_left']['mean']:.2f} crores")
+            with col3:
+                st.metric("Full Squads", f"{result['full_squad_rate']:.1%}")
+            
+            st.subheader("Price per Role (crores)")
+            st.dataframe(pd.DataFrame(result['price_by_role']).T, use_container_width=True)
+            st.subheader("By Bidding Strategy")
+            st.dataframe(pd.DataFrame({
+                name: {'Avg. Spent': s['spent']['mean'], 'Squad Completion': s['squad_completion']['mean']}
+                for name, s in result['by_strategy'].items()
+            }).T, use_container_width=True)
 
 def check_auction_complete():
     # Check if auction is complete (all teams have max players or can't bid)
-    eligible_teams = [t for t in st.session_state.teams if t['can_bid']]
-    if not eligible_teams or not st.session_state.remaining_players:
+    if st.session_state.engine.is_complete():
         st.session_state.auction_complete = True
+        # Build every results download once, so the results page itself never touches disk
+        begin('build export')
+        st.session_state.export = build_export(st.session_state.engine)
+        if st.session_state.room is not None:
+            rooms.close(st.session_state.room.id)
         set_stage('results')
 
+def cached_table(kind, version, build, *key):
+    """A DataFrame from the shared render cache, rebuilt only when `version` changes."""
+    engine = st.session_state.engine
+    return render_cache.get_or_build((engine.id, kind, *key, version), build)
+
+def squad_table(team, with_matches=False):
+    engine = st.session_state.engine
+    
+    def build():
+        player_data = []
+        for p in engine.squad(team):
+            row = {
+                'Name': p['name'],
+                'Role': p['role'],
+                'Country': p['country'],
+                'Price': f"₹{p.get('sold_price', 0)} crores",
+                'Batting Avg': p['stats']['batting_avg'],
+                'Bowling Avg': p['stats']['bowling_avg']
+            }
+            if with_matches:
+                row['Matches'] = p['stats']['matches_played']
+            player_data.append(row)
+        return pd.DataFrame(player_data)
+    
+    version = engine.ledger.roster_versions[team['id']]
+    return cached_table('squad', version, build, team['id'], with_matches)
+
+def transactions_table():
+    engine = st.session_state.engine
+    
+    def build():
+        transactions = []
+        for player_id, team_id, price in engine.ledger.transactions:
+            p = engine.players[player_id]
+            bids = engine.ledger.bid_history.get(player_id, [])
+            automatic = sum(1 for _, _, proxy in bids if proxy)
+            transactions.append({
+                'Player': p['name'],
+                'Role': p['role'],
+                'Team': engine.team(team_id)['name'],
+                'Price': f"₹{price} crores",
+                'Bids': f"{len(bids)} ({automatic} automatic)" if automatic else str(len(bids)),
+            })
+        return pd.DataFrame(transactions)
+    
+    return cached_table('transactions', engine.ledger.sold_count, build)
+
+def stats_table(player):
+    # A player's stats never change during the auction, so the id is the whole key
+    def build():
+        return pd.DataFrame({
+            'Stat': ['Batting Average', 'Bowling Average', 'Matches Played'],
+            'Value': [player['stats']['batting_avg'], player['stats']['bowling_avg'], player['stats']['matches_played']]
+        })
+    
+    return cached_table('stats', 0, build, player['id'])
+
 def view_team_players(team):
-    players = team['players']
-    if not players:
+    if not team['players']:
         st.info(f"{team['name']} hasn't acquired any players yet.")
         return
     
-    player_data = []
-    for p in players:
-        player_data.append({
-            'Name': p['name'],
+    st.dataframe(squad_table(team), use_container_width=True)
+
+def place_bid(team_id, seen_version):
+    action('bid')
+    try:
+        st.session_state.room.bid(team_id, seen_version)
+    except StaleActionError:
+        notify("Another bid landed first. Check the new price and bid again.", icon="⏱️")
+    except AuctionError as e:
+        notify(str(e), icon="⚠️")
+
+def sell_lot(seen_version):
+    action('sold')
+    try:
+        player, team, price = st.session_state.room.hammer(seen_version)
+    except StaleActionError:
+        notify("A new bid came in before the hammer fell.", icon="⏱️")
+    else:
+        notify(f"{player['name']} sold to {team['name']} for ₹{price} crores!", icon="✅")
+
+def pass_lot(seen_version):
+    action('unsold')
+    try:
+        player = st.session_state.room.pass_lot(seen_version)
+    except StaleActionError:
+        notify("A bid came in before the lot was closed.", icon="⏱️")
+    else:
+        notify(f"{player['name']} remains unsold.", icon="❌")
+
+def set_max_bid(team_id, player_id):
+    action('proxy')
+    max_bid = st.session_state[f"max_{team_id}"]
+    try:
+        bids = st.session_state.room.set_proxy(team_id, max_bid, player_id)
+    except StaleActionError:
+        notify("That lot closed before the max bid was set.", icon="⏱️")
+    except AuctionError as e:
+        notify(str(e), icon="⚠️")
+    else:
+        if bids:
+            engine = st.session_state.engine
+            last_team, last_amount = bids[-1]
+            notify(f"{len(bids)} automatic bids placed; {engine.team(last_team)['name']} leads at ₹{last_amount} crores.",
+                   icon="🤖")
+        else:
+            notify(f"Max bid of ₹{max_bid} crores set.", icon="🤖")
+
+def live_updates(room, seen_version, team_id=None):
+    """Hold the page open and rerun as soon as anything happens in the room.
+    
+    A bidder's page (`team_id`) stays live and keeps checking in with the room;
+    the auctioneer's only while some bidder session is still checking in.
+    """
+    begin('live wait', idle=True)
+    status = st.empty()
+    while True:
+        if team_id is not None:
+            room.heartbeat(team_id)
+        bidders = room.live_bidders()
+        if team_id is None and not bidders:
+            status.empty()
+            return
+        # Writing to the page between waits lets Streamlit stop this run as soon as the user clicks something
+        status.caption(f"🔴 Live: {len(bidders)} teams bidding remotely")
+        if room.wait(seen_version, timeout=LIVE_WAIT) != seen_version:
+            break
+    st.experimental_rerun()  # Started by another session, so not charged to this one's last action
+
+def bidder_links(engine):
+    with st.expander("Bidder links"):
+        st.write("Each team can bid from its own browser with its link:")
+        st.markdown("\n".join(f"- [{team['name']}](?auction={engine.id}&team={team['id']})" for team in engine.teams))
+
+def team_page(engine, key):
+    """The teams to draw on this rerun.
+
+    Small auctions show every team. Larger ones get a search box, an
+    eligible-only filter and pages of TEAMS_PER_PAGE, so a rerun only builds
+    widgets for one page whatever the number of teams.
+    """
+    if len(engine.teams) <= TEAMS_PER_PAGE:
+        return engine.teams
+    
+    search_col, filter_col, page_col = st.columns([2, 1, 1])
+    with search_col:
+        query = st.text_input("Find Team", key=f"{key}_search").strip().lower()
+    with filter_col:
+        eligible_only = st.checkbox("Only teams that can bid", key=f"{key}_eligible")
+    
+    teams = engine.eligible_teams() if eligible_only else engine.teams
+    if query:
+        teams = [team for team in teams if query in team['name'].lower()]
+    pages = max(1, math.ceil(len(teams) / TEAMS_PER_PAGE))
+    with page_col:
+        page = st.selectbox(f"Page (of {pages})", range(1, pages + 1), key=f"{key}_page")
+    
+    st.caption(f"{len(teams)} of {len(engine.teams)} teams, {engine.eligible_count()} still bidding")
+    return teams[(page - 1) * TEAMS_PER_PAGE:page * TEAMS_PER_PAGE]
+
+def pool_browser(engine):
+    """Filter, sort and page through the whole pool.
+
+    Queries go through the pool's indexes and only the page on screen is
+    turned into rows, so this stays quick on pools of millions of players.
+    """
+    index = engine.index
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        status = st.selectbox("Players", ["All", "Available", "Sold", "Unsold"], key="pool_status")
+    with col2:
+        roles = st.multiselect("Role", engine.players.roles, key="pool_roles")
+    with col3:
+        countries = st.multiselect("Country", engine.players.countries, key="pool_countries")
+    with col4:
+        name = st.text_input("Name contains", key="pool_name").strip()
+    
+    ranges = {}
+    for col, (label, column) in zip(st.columns(len(POOL_COLUMNS)), POOL_COLUMNS.items()):
+        bounds = index.bounds(column)
+        if bounds is None:
+            continue  # Nobody in the pool has this stat
+        low, high = math.floor(bounds[0] * 10) / 10, math.ceil(bounds[1] * 10) / 10
+        if low >= high:
+            continue
+        with col:
+            picked = st.slider(label, low, high, (low, high), key=f"pool_{column}")
+        if picked != (low, high):
+            ranges[column] = picked
+    
+    ids = engine.find_players(None if status == "All" else status.lower(), roles=roles or None,
+                              countries=countries or None, name=name or None, **ranges)
+    
+    sort_col, order_col, page_col = st.columns(3)
+    with sort_col:
+        sort_by = st.selectbox("Sort by", list(POOL_COLUMNS), key="pool_sort")
+    with order_col:
+        descending = st.checkbox("Highest first", value=True, key="pool_descending")
+    pages = max(1, math.ceil(len(ids) / POOL_PAGE_SIZE))
+    with page_col:
+        page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, step=1, key="pool_page")
+    
+    page = min(page, pages)  # The page kept from before the filters narrowed the list
+    ids = index.sort(ids, POOL_COLUMNS[sort_by], descending)
+    st.caption(f"{len(ids):,} of {len(engine.players):,} players")
+    rows = []
+    for p in engine.players.rows(ids[(page - 1) * POOL_PAGE_SIZE:page * POOL_PAGE_SIZE]):
+        rows.append({
+            'Player': p['name'],
             'Role': p['role'],
             'Country': p['country'],
-            'Price': f"₹{p.get('sold_price', 0)} crores",
+            'Base Price': f"₹{p['base_price']} crores",
             'Batting Avg': p['stats']['batting_avg'],
-            'Bowling Avg': p['stats']['bowling_avg']
+            'Bowling Avg': p['stats']['bowling_avg'],
+            'Matches': p['stats']['matches_played'],
+            'Status': engine.player_status(p.id).capitalize(),
         })
-    
-    st.dataframe(pd.DataFrame(player_data), use_container_width=True)
+    if rows:
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+    else:
+        st.info("No players match these filters.")
 
 def auction_screen():
+    engine = st.session_state.engine
+    room = st.session_state.room
+    team_id = st.session_state.team_id
     st.title("🏏 Cricket Player Auction")
+    if team_id is not None:
+        st.caption(f"Bidding as {engine.team(team_id)['name']}")
+    
+    # Show the outcome of a player import once, on the first auction render
+    report = st.session_state.pop('import_report', None)
+    if report:
+        st.success(f"Imported {report['imported']} of {report['rows']} players.")
+        if report['skipped']:
+            st.warning(f"Skipped {report['skipped']} invalid rows:\n\n" + "\n".join(f"- {e}" for e in report['errors']))
     
-    # Display teams and their status
-    cols = st.columns(len(st.session_state.teams))
-    for i, team in enumerate(st.session_state.teams):
+    # Display teams and their status, a page at a time for large auctions
+    begin('team status')
+    visible_teams = team_page(engine, 'auction_teams')
+    cols = st.columns(max(1, len(visible_teams)))
+    for i, team in enumerate(visible_teams):
         with cols[i]:
             st.subheader(team['name'])
             st.metric("Remaining Purse", f"₹{team['purse']} crores")
@@ -143,39 +626,33 @@ def auction_screen():
             if st.expander(f"View {team['name']} Squad"):
                 view_team_players(team)
             
-            # Disable bidding if team has reached max squad size
-            if len(team['players']) >= st.session_state.max_squad_size:
-                team['can_bid'] = False
+            if engine.squad_full(team):
                 st.warning("Squad Full")
-            
-            # Disable bidding if team has insufficient funds for minimum bid
-            if team['purse'] < 0.5:  # Assuming 0.5 crore is the minimum bid possible
-                team['can_bid'] = False
+            elif not team['can_bid']:
                 st.warning("Insufficient Funds")
+            else:
+                standing = engine.standing(team['id'])
+                needs = standing.needs()
+                if needs:
+                    st.caption("Needs " + ", ".join(f"{count} {role}" for role, count in needs.items()))
+                if engine.rules.max_overseas is not None:
+                    st.caption(f"Overseas: {standing.overseas} of {engine.rules.max_overseas}")
     
     # Check if auction is complete
+    begin('completion check')
     check_auction_complete()
     if st.session_state.auction_complete:
-        st.experimental_rerun()
-    
-    # Player selection
-    if st.session_state.current_player is None and st.session_state.remaining_players:
-        # Get a new player for auction
-        # Sort remaining players by base price for more interesting auction experience
-        sorted_players = sorted(st.session_state.remaining_players, key=lambda x: x['base_price'], reverse=True)
-        player_index = random.randint(0, min(9, len(sorted_players)-1))  # Pick from top 10 players
-        st.session_state.current_player = sorted_players[player_index]
-        st.session_state.current_bid = st.session_state.current_player['base_price']
-        st.session_state.current_team = None
-        
-        # Remove this player from remaining players
-        st.session_state.remaining_players = [p for p in st.session_state.remaining_players 
-                                              if p['id'] != st.session_state.current_player['id']]
+        rerun()
+    
+    # Player selection; every action below carries the room version this page was drawn from
+    begin('lot selection')
+    player = room.next_lot()
+    seen_version = room.version
     
     # Display current player for auction
-    if st.session_state.current_player:
+    if player:
+        begin('lot panel')
         st.markdown("---")
-        player = st.session_state.current_player
     
         # Make the auctioning panel bigger
         auction_col, bid_col = st.columns([3, 1])  # Make auction details take more space
@@ -183,166 +660,173 @@ def auction_screen():
         with auction_col:
             st.markdown(f"<h2 style='text-align: center; color: #ff4b4b;'>🎯 Now Auctioning: {player['name']}</h2>", unsafe_allow_html=True)
             st.markdown(f"<h4 style='text-align: center;'>Role: {player['role']} | Country: {player['country']}</h4>", unsafe_allow_html=True)
+            if engine.current_set:
+                st.markdown(f"<p style='text-align: center;'>Set: {engine.current_set}</p>", unsafe_allow_html=True)
             st.markdown(f"<h3 style='text-align: center; color: #007bff;'>Base Price: ₹{player['base_price']} crores</h3>", unsafe_allow_html=True)
     
             # Stats table
-            stats_df = pd.DataFrame({
-                'Stat': ['Batting Average', 'Bowling Average', 'Matches Played'],
-                'Value': [player['stats']['batting_avg'], player['stats']['bowling_avg'], player['stats']['matches_played']]
-            })
-            st.table(stats_df)
+            st.table(stats_table(player))
     
         with bid_col:
             st.markdown("<h2 style='text-align: center;'>Current Bid</h2>", unsafe_allow_html=True)
-            st.markdown(f"<h1 style='text-align: center; color: #28a745;'>₹{st.session_state.current_bid} crores</h1>", unsafe_allow_html=True)
+            st.markdown(f"<h1 style='text-align: center; color: #28a745;'>₹{engine.current_bid} crores</h1>", unsafe_allow_html=True)
             
-            if st.session_state.current_team:
-                team = next((t for t in st.session_state.teams if t['id'] == st.session_state.current_team), None)
-                if team:
-                    st.markdown(f"<h3 style='text-align: center; color: #ff9800;'>Current Bidder: {team['name']}</h3>", unsafe_allow_html=True)
+            if engine.current_team:
+                team = engine.team(engine.current_team)
+                st.markdown(f"<h3 style='text-align: center; color: #ff9800;'>Current Bidder: {team['name']}</h3>", unsafe_allow_html=True)
     
         st.markdown("---")
 
         
-        # Bidding interface
-        cols = st.columns(len(st.session_state.teams) + 1)  # +1 for the unsold button
-        
-        # Calculate minimum bid increment
-        if st.session_state.current_bid < 1:
-            increment = 0.05
-        elif st.session_state.current_bid < 2:
-            increment = 0.1
-        elif st.session_state.current_bid < 5:
-            increment = 0.2
-        else:
-            increment = 0.25
+        begin('bid buttons')
+        # Bidding interface: the auctioneer's screen has every team, a bidder's screen only its own
+        bidding_teams = visible_teams if team_id is None else [engine.team(team_id)]
+        cols = st.columns(len(bidding_teams) + 1)  # +1 for the unsold button
+        new_bid = engine.next_bid_amount()
         
         # Create a bid button for each team
-        for i, team in enumerate(st.session_state.teams):
+        for i, team in enumerate(bidding_teams):
             with cols[i]:
-                new_bid = round(st.session_state.current_bid + increment, 2)
-                can_bid = team['can_bid'] and team['purse'] >= new_bid
-                
-                if can_bid:
-                    bid_button = st.button(f"{team['name']}\n₹{new_bid} crores", key=f"bid_{team['id']}")
-                    if bid_button:
-                        st.session_state.current_bid = new_bid
-                        st.session_state.current_team = team['id']
-                        st.experimental_rerun()
+                if engine.can_bid(team['id']):
+                    st.button(f"{team['name']}\n₹{new_bid} crores", key=f"bid_{team['id']}",
+                              on_click=place_bid, args=(team['id'], seen_version))
                 else:
-                    st.button(f"{team['name']}\nCannot Bid", disabled=True)
-        
-        # Add the "Sold!" button in the last column
-        with cols[-1]:
-            if st.session_state.current_team:  # Only enable if someone has bid
-                sold_button = st.button("SOLD! ⚡", key="sold_button")
-                if sold_button:
-                    # Add player to the team that won the bid
-                    team = next((t for t in st.session_state.teams if t['id'] == st.session_state.current_team), None)
-                    if team:
-                        player['status'] = 'sold'
-                        player['sold_to'] = team['name']
-                        player['sold_price'] = st.session_state.current_bid
-                        team['players'].append(player)
-                        team['purse'] -= st.session_state.current_bid
-                        
-                        st.success(f"{player['name']} sold to {team['name']} for ₹{st.session_state.current_bid} crores!")
-                        time.sleep(1)  # Pause briefly to show the success message
-                        
-                        # Reset for next player
-                        st.session_state.current_player = None
-                        st.session_state.current_bid = 0
-                        st.session_state.current_team = None
-                        st.experimental_rerun()
-            else:
-                st.button("SOLD! ⚡", disabled=True)
+                    st.button(f"{team['name']}\nCannot Bid", disabled=True, key=f"nobid_{team['id']}")
+                
+                # Precomputed from the team's squad, so this is a lookup per team
+                limit = engine.max_bid(team['id'])
+                if team['can_bid']:
+                    st.caption(f"Can go up to ₹{limit} crores" if limit is not None else "Ruled out by the squad rules")
+                
+                # A max bid keeps raising for the team until it is reached
+                if team['can_bid']:
+                    st.number_input("Max Bid (crores)", min_value=0.0, value=float(player['base_price']), step=0.25,
+                                    key=f"max_{team['id']}")
+                    st.button("Set Max Bid", key=f"proxy_{team['id']}", on_click=set_max_bid,
+                              args=(team['id'], player['id']))
+                    max_bid = engine.proxy(team['id'])
+                    if max_bid is not None:
+                        st.caption(f"Max bid: ₹{max_bid} crores")
         
-        # Add "Unsold" button
-        unsold_button = st.button("Unsold ❌", key="unsold_button")
-        if unsold_button:
-            player['status'] = 'unsold'
-            st.info(f"{player['name']} remains unsold.")
-            time.sleep(1)  # Pause briefly to show the info message
+        # Only the auctioneer closes lots
+        if team_id is None:
+            # Add the "Sold!" button in the last column
+            with cols[-1]:
+                if engine.current_team:  # Only enable if someone has bid
+                    st.button("SOLD! ⚡", key="sold_button", on_click=sell_lot, args=(seen_version,))
+                else:
+                    st.button("SOLD! ⚡", disabled=True)
             
-            # Reset for next player
-            st.session_state.current_player = None
-            st.session_state.current_bid = 0
-            st.session_state.current_team = None
-            st.experimental_rerun()
+            # Add "Unsold" button
+            st.button("Unsold ❌", key="unsold_button", on_click=pass_lot, args=(seen_version,))
     
     # Show auction progress
+    begin('progress')
     st.markdown("---")
     st.subheader("Auction Progress")
     
-    sold_players = [p for p in st.session_state.players if p['status'] == 'sold']
-    unsold_players = [p for p in st.session_state.players if p['status'] == 'unsold']
-    remaining_players = st.session_state.remaining_players
+    ledger = engine.ledger
     
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Players Sold", len(sold_players))
+        st.metric("Players Sold", ledger.sold_count)
     with col2:
-        st.metric("Players Unsold", len(unsold_players))
+        st.metric("Players Unsold", ledger.passed_count)
     with col3:
-        st.metric("Players Remaining", len(remaining_players))
+        st.metric("Players Remaining", len(engine.remaining_players))
+        if engine.lot_sets:
+            st.caption(" · ".join(f"{name}: {left}" for name, left in engine.remaining_players.remaining()))
     
     # Option to view transaction log
     if st.checkbox("Show Transaction Log"):
-        if sold_players:
-            transactions = []
-            for p in sold_players:
-                transactions.append({
-                    'Player': p['name'],
-                    'Role': p['role'],
-                    'Team': p.get('sold_to', ''),
-                    'Price': f"₹{p.get('sold_price', 0)} crores"
-                })
-            st.table(pd.DataFrame(transactions))
+        begin('transaction log')
+        if ledger.transactions:
+            st.table(transactions_table())
         else:
             st.info("No transactions yet.")
+    
+    if st.checkbox("Browse Player Pool"):
+        begin('pool browser')
+        pool_browser(engine)
+    
+    begin('bidder links')
+    if team_id is None:
+        bidder_links(engine)
+    if team_id is not None or room.live_bidders():
+        live_updates(room, seen_version, team_id)
 
-def save_team_to_csv(team):
-    """Save individual team data to a CSV file"""
-    if not os.path.exists('team_data'):
-        os.makedirs('team_data')
-        
-    if not team['players']:
-        return False
-        
-    player_data = []
-    for p in team['players']:
-        player_data.append({
-            'Name': p['name'],
-            'Role': p['role'],
-            'Country': p['country'],
-            'Price (crores)': p.get('sold_price', 0),
-            'Batting Avg': p['stats']['batting_avg'],
-            'Bowling Avg': p['stats']['bowling_avg'],
-            'Matches': p['stats']['matches_played']
-        })
+def auction_analytics(directories):
+    sales = value_for_money(load_journals(directories))
+    teams = team_strategies(sales)
+    return {
+        'sales': sales,
+        'teams': teams,
+        'strategies': strategy_summary(teams),
+        'inflation': inflation_by_band(sales),
+        'role': spend_by(sales, 'role'),
+        'country': spend_by(sales, 'country'),
+    }
+
+def past_auctions(engine):
+    """Charts over every completed auction journaled on this server, this one included."""
+    directories = completed_auctions()
+    if not directories:
+        st.info("No completed auctions have been saved yet.")
+        return
+    try:
+        # Built once per set of completed auctions and shared by every session
+        stats = render_cache.get_or_build(('past_auctions', tuple(directories)),
+                                          lambda: auction_analytics(directories))
+    except AnalyticsError as e:
+        st.error(str(e))
+        return
     
-    df = pd.DataFrame(player_data)
+    sales = stats['sales']
+    this = sales[sales['auction'] == engine.id]
+    st.caption(f"{sales['auction'].nunique():,} auctions, {len(sales):,} players sold, "
+               f"₹{sales['price'].sum():,.2f} crores spent")
     
-    # Add team summary at the bottom
-    summary_df = pd.DataFrame([{
-        'Name': f"TEAM SUMMARY: {team['name']}",
-        'Role': '',
-        'Country': '',
-        'Price (crores)': team['original_purse'] - team['purse'],
-        'Batting Avg': '',
-        'Bowling Avg': '',
-        'Matches': ''
-    }])
+    col1, col2 = st.columns(2)
+    for col, column, title in [(col1, 'role', "Share of Spend by Role"), (col2, 'country', "Share of Spend by Country")]:
+        with col:
+            st.subheader(title)
+            shares = pd.DataFrame({'All auctions': stats[column]['share']})
+            if len(this):
+                shares['This auction'] = spend_by(this, column)['share']
+            st.bar_chart(shares)
     
-    result_df = pd.concat([df, summary_df])
+    st.subheader("Price Inflation by Increment Band")
+    inflation = stats['inflation']
+    st.bar_chart(inflation[['avg_markup']].rename(columns={'avg_markup': 'Average markup over base price'}))
+    st.dataframe(inflation.rename(columns={
+        'sales': 'Sales', 'avg_price': 'Avg. Price', 'median_markup': 'Median Markup', 'avg_markup': 'Avg. Markup',
+        'avg_raises': 'Avg. Raises',
+    }).round(2), use_container_width=True)
     
-    # Replace invalid characters in team name for filename
-    filename = team['name'].replace(" ", "_").replace("/", "_").replace("\\", "_")
-    filepath = f"team_data/{filename}.csv"
-    result_df.to_csv(filepath, index=False)
-    return filepath
+    st.subheader("Team Strategies")
+    st.caption("Star-heavy teams spent half their money on their top 3 buys; others are named after the role "
+               "they spent most on, or balanced. Value is player rating minus price rank, within each role.")
+    st.dataframe(stats['strategies'].rename(columns={
+        'teams': 'Teams', 'avg_spent': 'Avg. Spent', 'avg_players': 'Avg. Players', 'avg_top3_share': 'Top 3 Share',
+        'avg_value': 'Avg. Value',
+    }).round(2), use_container_width=True)
+    if len(this):
+        teams = stats['teams'].loc[engine.id]
+        st.dataframe(teams[['team', 'strategy', 'spent', 'top3_share', 'value']].rename(columns={
+            'team': 'Team', 'strategy': 'Strategy', 'spent': 'Spent', 'top3_share': 'Top 3 Share', 'value': 'Avg. Value',
+        }).round(2), hide_index=True, use_container_width=True)
+        
+        st.subheader("Best Value Buys in This Auction")
+        st.dataframe(this.nlargest(10, 'value')[['team', 'player', 'role', 'price', 'rating', 'value']].rename(columns={
+            'team': 'Team', 'player': 'Player', 'role': 'Role', 'price': 'Price', 'rating': 'Rating', 'value': 'Value',
+        }).round(2), hide_index=True, use_container_width=True)
 
 def results_screen():
+    engine = st.session_state.engine
+    if 'export' not in st.session_state:
+        begin('build export')
+        st.session_state.export = build_export(engine)
+    export = st.session_state.export
     st.title("🏆 Auction Results")
     
     st.markdown("""
@@ -351,46 +835,38 @@ def results_screen():
     """)
     
     # Summary statistics
-    total_spent = sum(team['original_purse'] - team['purse'] for team in st.session_state.teams)
-    avg_player_price = round(total_spent / sum(len(team['players']) for team in st.session_state.teams), 2) if sum(len(team['players']) for team in st.session_state.teams) > 0 else 0
+    begin('summary')
+    ledger = engine.ledger
     
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Total Amount Spent", f"₹{total_spent} crores")
+        st.metric("Total Amount Spent", f"₹{ledger.total_spent} crores")
     with col2:
-        st.metric("Avg. Player Price", f"₹{avg_player_price} crores")
+        st.metric("Avg. Player Price", f"₹{ledger.average_price} crores")
     with col3:
-        sold_players = [p for p in st.session_state.players if p['status'] == 'sold']
-        if sold_players:
-            highest_paid = max(sold_players, key=lambda x: x.get('sold_price', 0))
-            st.metric("Highest Paid Player", f"{highest_paid['name']} (₹{highest_paid.get('sold_price', 0)} crores)")
+        if ledger.sold_count:
+            player_id, price = ledger.top_sales(1)[0]
+            st.metric("Highest Paid Player", f"{engine.players[player_id]['name']} (₹{price} crores)")
         else:
             st.metric("Highest Paid Player", "None")
     
     # Team tabs
-    team_tabs = st.tabs([team['name'] for team in st.session_state.teams])
+    begin('team tabs')
+    visible_teams = team_page(engine, 'results_teams')
+    team_tabs = st.tabs([team['name'] for team in visible_teams] or ["No teams"])
     
-    team_files = []
-    for i, tab in enumerate(team_tabs):
+    for team, tab in zip(visible_teams, team_tabs):
         with tab:
-            team = st.session_state.teams[i]
-            
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("Players Acquired", len(team['players']))
+                st.metric("Players Acquired", ledger.players_by_team[team['id']])
             with col2:
-                st.metric("Purse Spent", f"₹{team['original_purse'] - team['purse']} crores")
+                st.metric("Purse Spent", f"₹{ledger.spent_by_team[team['id']]} crores")
             with col3:
                 st.metric("Purse Remaining", f"₹{team['purse']} crores")
             
             # Team composition by role
-            roles = {}
-            for player in team['players']:
-                role = player['role']
-                if role in roles:
-                    roles[role] += 1
-                else:
-                    roles[role] = 1
+            roles = ledger.roles_by_team[team['id']]
             
             if roles:
                 st.subheader("Team Composition")
@@ -403,79 +879,130 @@ def results_screen():
             # Player details
             st.subheader("Player List")
             if team['players']:
-                player_data = []
-                for p in team['players']:
-                    player_data.append({
-                        'Name': p['name'],
-                        'Role': p['role'],
-                        'Country': p['country'],
-                        'Price': f"₹{p.get('sold_price', 0)} crores",
-                        'Batting Avg': p['stats']['batting_avg'],
-                        'Bowling Avg': p['stats']['bowling_avg'],
-                        'Matches': p['stats']['matches_played']
-                    })
-                st.dataframe(pd.DataFrame(player_data), use_container_width=True)
+                st.dataframe(squad_table(team, with_matches=True), use_container_width=True)
                 
-                # Save team data to CSV
-                filepath = save_team_to_csv(team)
-                if filepath:
-                    team_files.append((team['name'], filepath))
-                    
-                    # Provide download button for this team's CSV
-                    team_df = pd.read_csv(filepath)
-                    csv = team_df.to_csv(index=False).encode('utf-8')
-                    st.download_button(
-                        label=f"Download {team['name']} Squad",
-                        data=csv,
-                        file_name=f"{team['name']}_squad.csv",
-                        mime="text/csv",
-                    )
+                # Provide download button for this team's CSV
+                st.download_button(
+                    label=f"Download {team['name']} Squad",
+                    data=export.team_files[team['id']][1],
+                    file_name=f"{team['name']}_squad.csv",
+                    mime="text/csv",
+                    key=f"download_{team['id']}",
+                )
             else:
                 st.info("No players acquired.")
     
+    if st.checkbox("Compare with Past Auctions"):
+        begin('past auctions')
+        past_auctions(engine)
+    
     # Download all results
-    if st.button("Download Complete Auction Results"):
-        results = []
-        for team in st.session_state.teams:
-            for player in team['players']:
-                results.append({
-                    'Team': team['name'],
-                    'Player': player['name'],
-                    'Role': player['role'],
-                    'Country': player['country'],
-                    'Price (crores)': player.get('sold_price', 0),
-                    'Batting Avg': player['stats']['batting_avg'],
-                    'Bowling Avg': player['stats']['bowling_avg'],
-                    'Matches': player['stats']['matches_played']
-                })
-        
-        results_df = pd.DataFrame(results)
-        
-        # Convert dataframe to CSV
-        csv = results_df.to_csv(index=False).encode('utf-8')
+    begin('downloads')
+    st.markdown("---")
+    col1, col2, col3 = st.columns(3)
+    with col1:
         st.download_button(
             label="Download Complete Auction CSV",
-            data=csv,
+            data=export.results_csv,
             file_name="cricket_auction_results.csv",
             mime="text/csv",
         )
+    with col2:
+        st.download_button(
+            label="Download All Results (zip)",
+            data=export.bundle,
+            file_name="cricket_auction_results.zip",
+            mime="application/zip",
+        )
+    with col3:
+        if st.button(f"Save Files to {EXPORT_DIR}/"):
+            action('save files')
+            st.session_state.export_save = save_export(export)
     
     # Display information about saved files
-    if team_files:
-        st.markdown("---")
+    saving = st.session_state.get('export_save')
+    if saving is not None:
         st.subheader("Team Files Saved")
-        st.write("Each team's data has been saved to a separate CSV file with their respective name.")
-        for team_name, filepath in team_files:
-            st.success(f"{team_name}: {filepath}")
+        if not saving.done():
+            st.info("Saving files in the background...")
+        elif saving.exception():
+            st.error(f"Could not save files: {saving.exception()}")
+        else:
+            st.write("Each team's data has been saved to a separate CSV file with their respective name.")
+            for filepath in saving.result():
+                st.success(filepath)
     
     # Reset auction
     if st.button("Start New Auction"):
+        action('new auction')
+        # The profiler outlives the auction so its numbers cover the whole session
         for key in st.session_state.keys():
-            del st.session_state[key]
-        st.experimental_rerun()
+            if key != 'profiler':
+                del st.session_state[key]
+        st.query_params.clear()
+        rerun()
+
+def debug_panel():
+    """Timings of the previous rerun and session totals, behind a sidebar switch."""
+    if not st.sidebar.checkbox("Show performance panel", key="debug_panel"):
+        return
+    profiler = st.session_state.profiler
+    sidebar = st.sidebar
+    
+    last = profiler.last
+    if last:
+        sidebar.metric("Last Rerun", f"{last['busy_ms']:.1f} ms",
+                       help=f"{last['total_ms']:.1f} ms including time spent waiting for other sessions")
+        sidebar.caption(f"Stage: {last['stage']} · Action: {last['action'] or 'widget'} · Rerun #{last['rerun']}")
+        sidebar.dataframe(
+            pd.DataFrame({'ms': last['sections']}).sort_values('ms', ascending=False),
+            use_container_width=True,
+        )
+    
+    if profiler.actions:
+        sidebar.write("Reruns per action")
+        sidebar.dataframe(pd.DataFrame({
+            'Taken': profiler.actions,
+            'Reruns': {name: profiler.reruns_by_action[name] for name in profiler.actions},
+        }), use_container_width=True)
+    
+    sidebar.caption(f"Session state: {profiler.state_bytes / 1e6:.2f} MB (peak {profiler.peak_state_bytes / 1e6:.2f} MB)")
+    cache = render_cache.stats()
+    sidebar.caption(f"Render cache: {cache['hits']} hits, {cache['misses']} misses, "
+                    f"{cache['entries']}/{cache['max_entries']} tables")
+    sink = profiler.sink
+    if sink is not None and sink.error is not None:
+        sidebar.warning(f"Metrics are not being saved: {sink.error}")
+    elif sink is not None and sink.path:
+        sidebar.caption(f"Metrics: {sink.path}")
 
 # Main app logic
 def main():
+    profiler = st.session_state.profiler
+    profiler.start(st.session_state.app_stage)
+    try:
+        run_stage()
+    finally:
+        profiler.finish(st.session_state)
+
+def run_stage():
+    show_notifications()
+    debug_panel()
+    
+    # A new session opened on an auction URL (a refresh, or the server restarted) resumes from the journal
+    # Sessions opened on the same URL share one room; `team` in the URL makes this a single team's bidding screen
+    auction_id = st.query_params.get('auction')
+    if st.session_state.engine is None and auction_id:
+        directory = os.path.join(JOURNAL_DIR, os.path.basename(auction_id))
+        if not (auction_id in rooms or os.path.isdir(directory)) or not resume_auction(directory):
+            st.query_params.clear()
+        elif st.query_params.get('team'):
+            try:
+                st.session_state.room.claim(st.query_params['team'])
+                st.session_state.team_id = st.query_params['team']
+            except AuctionError as e:
+                st.error(str(e))
+    
     if st.session_state.app_stage == 'setup':
         setup_teams()
     elif st.session_state.app_stage == 'auction':
@@ -0,0 +1,492 @@
+"""Auction rules without any UI.
+
+`AuctionEngine` owns the teams, the `PlayerStore` and the lot currently under
+the hammer. Squads and the remaining pool hold player ids; players are handed
+out as `PlayerRow` views. Lots can run in sets picked from the pool's
+indexes (`player_index.py`), which also serve filtered searches of the pool.
+
+Who may bid how much is decided by the squad rules (`squad_rules.py`): each
+team's limits are recomputed when it buys a player, so checking a bid is a
+lookup.
+
+Every state change is also published as a small event dict (see `subscribe`)
+so it can be journaled and later replayed with `apply`. `app.py` renders its
+state and forwards button clicks to it, and the benchmarks drive it directly
+at machine speed.
+"""
+import random
+import uuid
+
+import numpy as np
+
+from ledger import AuctionLedger
+from player_index import PlayerIndex
+from player_pool import LotSets, RemainingPool
+from players import SOLD
+from squad_rules import SquadRules, SquadStanding
+
+TOP_K = 10  # Each lot is drawn at random from this many of the highest base prices
+OTHER_SET = 'Other players'  # Set for players no lot set picks, auctioned last
+POOL_STATUSES = ['available', 'sold', 'unsold']
+
+# (upper bound of the bid band in crores, increment) - the last band is open ended
+INCREMENT_LADDER = [
+    (1, 0.05),
+    (2, 0.1),
+    (5, 0.2),
+    (None, 0.25),
+]
+
+
+def bid_increment(current_bid, ladder=INCREMENT_LADDER):
+    """Minimum raise over `current_bid` according to the increment ladder."""
+    for upper, step in ladder:
+        if upper is None or current_bid < upper:
+            return step
+
+
+def next_bid(current_bid, ladder=INCREMENT_LADDER):
+    return round(current_bid + bid_increment(current_bid, ladder), 2)
+
+
+def cheapest_bid(base_prices, ladder=INCREMENT_LADDER):
+    """The least any of these players can be won for: one raise over the lowest base price."""
+    return next_bid(float(base_prices.min()) if len(base_prices) else 0, ladder)
+
+
+def ladder_steps(current_bid, limit, ladder=INCREMENT_LADDER):
+    """How many successive `next_bid` raises from `current_bid` stay within `limit`.
+
+    Computed band by band in whole paise, so it costs O(len(ladder)) however
+    many steps there are.
+    """
+    price, limit = round(current_bid * 100), round(limit * 100)
+    steps = 0
+    for upper, step in ladder:
+        step = round(step * 100)
+        if upper is not None and price >= round(upper * 100):
+            continue
+        affordable = max(0, (limit - price) // step)
+        if upper is None:
+            return steps + affordable
+        # Raises taken in this band, the last one landing at or above its upper bound
+        in_band = -(-(round(upper * 100) - price) // step)
+        if affordable < in_band:
+            return steps + affordable
+        steps += in_band
+        price += in_band * step
+    return steps
+
+
+class AuctionError(Exception):
+    """Raised when an action is not allowed in the current auction state."""
+
+
+class AuctionEngine:
+    def __init__(self, teams, players, max_squad_size=15, rng=None, ladder=INCREMENT_LADDER, auction_id=None,
+                 rules=None, lot_sets=None):
+        self.id = auction_id or uuid.uuid4().hex  # Distinguishes this auction in caches and journals
+        self.teams = teams
+        self.players = players
+        self.rules = rules or SquadRules(max_squad_size)
+        self.max_squad_size = self.rules.max_squad_size
+        self.ladder = ladder
+        self.rng = rng or random.Random()
+
+        self._teams_by_id = {team['id']: team for team in teams}
+        self._eligible = dict(self._teams_by_id)  # Teams still able to bid, in team order
+        # Held back for every slot a team must still fill; a team that may not bid this much drops out
+        self.min_bid = cheapest_bid(players.column('base_price'), ladder)
+        self._standings = {}
+        for team in teams:
+            standing = self._standings[team['id']] = SquadStanding(self.rules, team['purse'], self.min_bid)
+            for player in players.rows(team['players']):
+                standing.add(player.role, self.rules.is_overseas(player.country), team['purse'])
+        self.ledger = AuctionLedger()
+        self._index = None
+        self._drawn_mask = np.zeros(len(players), dtype=bool)
+        # [{'name': ..., 'filters': {...}}, ...] - see `PlayerIndex.query` for the filters
+        self.lot_sets = lot_sets
+        if lot_sets:
+            self.remaining_players = self._split_sets(lot_sets)
+        else:
+            self.remaining_players = RemainingPool(zip(range(len(players)), players.column('base_price').tolist()))
+        self.current_player = None
+        self.current_bid = 0
+        self.current_team = None
+        self._lot_kind = None  # (role, overseas) of the player under the hammer
+        self._drawn = []  # Ids of every player put under the hammer, in order
+        self._listeners = []
+        self._proxies = {}  # Team id -> (max bid, registration number) for the open lot
+        self._proxy_count = 0  # Registrations on the open lot, which order ties between equal max bids
+
+        for team in teams:
+            self.refresh_eligibility(team)
+
+    @property
+    def nbytes(self):
+        """Memory held by the player store and its index, which dominate the auction's footprint."""
+        index = self._index.nbytes if self._index is not None else 0
+        return self.players.nbytes + index + self._drawn_mask.nbytes
+
+    @property
+    def index(self):
+        """`PlayerIndex` over the pool, built the first time it is needed."""
+        if self._index is None:
+            self._index = PlayerIndex(self.players)
+        return self._index
+
+    def _split_sets(self, lot_sets):
+        # Each player goes in the first set that picks them; players no set picks come last
+        taken = np.zeros(len(self.players), dtype=bool)
+        prices = self.players.column('base_price')
+        sets = []
+        for lot_set in lot_sets:
+            ids = self.index.query(where=~taken, **lot_set['filters'])
+            taken[ids] = True
+            sets.append((lot_set['name'], zip(ids.tolist(), prices[ids].tolist())))
+        rest = np.flatnonzero(~taken)
+        if len(rest):
+            sets.append((OTHER_SET, zip(rest.tolist(), prices[rest].tolist())))
+        return LotSets(sets)
+
+    @property
+    def current_set(self):
+        """Name of the set the current lot belongs to, when the auction runs in sets."""
+        return self.remaining_players.current_set if self.lot_sets else None
+
+    def find_players(self, status=None, **filters):
+        """Ids of the players matching `PlayerIndex.query` filters, optionally only those
+        'available' (still to be auctioned), 'sold' or 'unsold' (passed).
+        """
+        where = None
+        if status == 'available':
+            where = ~self._drawn_mask
+        elif status == 'sold':
+            where = self.players.column('status') == SOLD
+        elif status == 'unsold':
+            where = self._drawn_mask & (self.players.column('status') != SOLD)
+            if self.current_player is not None:
+                where[self.current_player.id] = False
+        elif status is not None:
+            raise ValueError(f"Unknown player status: {status!r}")
+        return self.index.query(where=where, **filters)
+
+    def player_status(self, player_id):
+        """'available', 'under the hammer', 'sold' or 'unsold' for one player."""
+        if self.current_player is not None and self.current_player.id == player_id:
+            return 'under the hammer'
+        if not self._drawn_mask[player_id]:
+            return 'available'
+        return 'sold' if self.players.column('status')[player_id] == SOLD else 'unsold'
+
+    def subscribe(self, listener):
+        """Call `listener(event)` after every state change.
+
+        Events are dicts with a 'type' of 'lot_opened', 'bid', 'proxy',
+        'hammer' or 'pass' plus the ids needed to replay them.
+        """
+        self._listeners.append(listener)
+
+    def _emit(self, event):
+        for listener in self._listeners:
+            listener(event)
+
+    def team(self, team_id):
+        try:
+            return self._teams_by_id[team_id]
+        except KeyError:
+            raise AuctionError(f"Unknown team: {team_id}") from None
+
+    def refresh_eligibility(self, team):
+        """Drop a team out of the bidding once the rules leave it nothing it can afford."""
+        best = self._standings[team['id']].best
+        if best is None or best < self.min_bid:
+            team['can_bid'] = False
+        if not team['can_bid']:
+            self._eligible.pop(team['id'], None)
+        return team['can_bid']
+
+    def squad_full(self, team):
+        return len(team['players']) >= self.max_squad_size
+
+    def standing(self, team_id):
+        self.team(team_id)
+        return self._standings[team_id]
+
+    def max_bid(self, team_id, player=None):
+        """Most `team_id` may pay for `player` (default: the one under the hammer) and still
+        complete a legal squad, or None if the rules do not let it buy them.
+
+        With no player, the most it may pay for any player.
+        """
+        standing = self.standing(team_id)
+        if player is None:
+            if self._lot_kind is None:
+                return standing.best
+            return standing.limit(*self._lot_kind)
+        return standing.limit(player.role, self.rules.is_overseas(player.country))
+
+    def squad(self, team):
+        return self.players.rows(team['players'])
+
+    def eligible_teams(self):
+        return list(self._eligible.values())
+
+    def eligible_count(self):
+        return len(self._eligible)
+
+    def is_complete(self):
+        # Complete once no team can bid, or every player has been under the hammer
+        if not self._eligible:
+            return True
+        return self.current_player is None and not self.remaining_players
+
+    def next_lot(self):
+        """Put the next player under the hammer and return it.
+
+        Returns the current player if a lot is already open, or None once the
+        pool is exhausted.
+        """
+        if self.current_player is not None:
+            return self.current_player
+        if not self.remaining_players:
+            return None
+
+        # Draw from the most expensive players for more interesting auction experience
+        return self._open_lot(self.remaining_players.draw(self.rng, TOP_K))
+
+    def open_lot(self, player_id):
+        """Put a specific player under the hammer, e.g. when replaying a journal."""
+        if self.current_player is not None:
+            raise AuctionError("A lot is already open")
+        if player_id not in self.remaining_players:
+            raise AuctionError(f"Player {player_id} is not in the remaining pool")
+        self.remaining_players.remove(player_id)
+        return self._open_lot(player_id)
+
+    def _open_lot(self, player_id):
+        player = self.players[player_id]
+        self._drawn.append(player_id)
+        self._drawn_mask[player_id] = True
+        self.current_player = player
+        self.current_bid = player['base_price']
+        self.current_team = None
+        self._lot_kind = (player.role, self.rules.is_overseas(player.country))
+        self._emit({'type': 'lot_opened', 'player': player_id})
+        return player
+
+    def next_bid_amount(self):
+        return next_bid(self.current_bid, self.ladder)
+
+    def can_bid(self, team_id):
+        if not self.team(team_id)['can_bid']:
+            return False
+        standing = self._standings[team_id]
+        limit = standing.best if self._lot_kind is None else standing.limit(*self._lot_kind)
+        return limit is not None and limit >= self.next_bid_amount()
+
+    def place_bid(self, team_id):
+        """Raise the current bid by one ladder step on behalf of `team_id`.
+
+        Teams with a proxy on the lot answer straight away (see `set_proxy`).
+        Returns the amount `team_id` bid.
+        """
+        amount = self._bid(team_id)
+        if self._proxies:
+            self._resolve_proxies()
+        return amount
+
+    def _bid(self, team_id, proxy=False):
+        if self.current_player is None:
+            raise AuctionError("No player is under the hammer")
+        if not self.can_bid(team_id):
+            raise AuctionError(f"{self.team(team_id)['name']} cannot bid ₹{self.next_bid_amount()} crores")
+
+        self.current_bid = self.next_bid_amount()
+        self.current_team = team_id
+        self.ledger.record_bid(team_id, self.current_bid, proxy)
+        event = {'type': 'bid', 'team': team_id, 'amount': self.current_bid}
+        if proxy:
+            event['proxy'] = True
+        self._emit(event)
+        return self.current_bid
+
+    def set_proxy(self, team_id, max_bid):
+        """Bid automatically for `team_id` on the open lot, up to `max_bid` crores.
+
+        Competing proxies are settled at once rather than raise by raise, and
+        the implied bids are placed (and published) in order. Returns them as
+        a list of (team id, amount).
+        """
+        if self.current_player is None:
+            raise AuctionError("No player is under the hammer")
+        self.team(team_id)
+        self._register_proxy(team_id, max_bid)
+        self._emit({'type': 'proxy', 'team': team_id, 'max_bid': max_bid})
+        return self._resolve_proxies()
+
+    def proxy(self, team_id):
+        """The max bid `team_id` registered on the open lot, or None."""
+        entry = self._proxies.get(team_id)
+        return entry[0] if entry else None
+
+    def _register_proxy(self, team_id, max_bid):
+        self._proxy_count += 1
+        self._proxies[team_id] = (max_bid, self._proxy_count)
+
+    def _resolve_proxies(self):
+        """Place the bids the registered proxies imply, without stepping through them.
+
+        The challenger with the highest limit always answers the leader, so
+        only the two strongest teams ever bid, alternating: the first to bid
+        is the strongest team unless it already leads. The weaker one's last
+        affordable raise on its turns fixes the final price in closed form;
+        the sequence is then written out for the record.
+        """
+        leader = self.current_team
+        contenders = []
+        for team_id, (max_bid, order) in self._proxies.items():
+            # The squad rules cap a proxy just as they cap a bid by hand
+            allowed = self.max_bid(team_id) if self.team(team_id)['can_bid'] else None
+            if allowed is None:
+                if team_id != leader:
+                    continue
+                allowed = self.current_bid
+            limit = min(max_bid, allowed)
+            steps = ladder_steps(self.current_bid, limit, self.ladder)
+            if team_id == leader or steps >= 1:
+                contenders.append((steps, limit, team_id == leader, -order, team_id))
+        if leader is not None and leader not in self._proxies:
+            contenders.append((0, self.current_bid, True, 0, leader))
+        if not any(not is_leader for _, _, is_leader, _, _ in contenders):
+            return []
+
+        contenders.sort(reverse=True)
+        strongest = contenders[0]
+        runner_up = contenders[1] if len(contenders) > 1 else None
+        first = strongest if strongest[4] != leader else runner_up
+        other = runner_up if first is strongest else strongest
+
+        if runner_up is None:
+            final = 1  # Nobody to answer: the only bidder takes the lot at the next step
+        else:
+            # The runner-up bids on odd raises if it goes first, otherwise on even ones
+            parity = 1 if first is runner_up else 0
+            last = runner_up[0] if runner_up[0] % 2 == parity else runner_up[0] - 1
+            if last < 1:
+                final = 1
+            elif last + 1 <= strongest[0]:
+                final = last + 1
+            else:
+                final = last
+
+        bids = []
+        for step in range(1, final + 1):
+            team_id = first[4] if step % 2 else other[4]
+            bids.append((team_id, self._bid(team_id, proxy=True)))
+        return bids
+
+    def hammer(self):
+        """Sell the current player to the highest bidder.
+
+        Returns a (player, team, price) tuple.
+        """
+        if self.current_player is None:
+            raise AuctionError("No player is under the hammer")
+        if self.current_team is None:
+            raise AuctionError("Cannot sell a player nobody has bid on")
+
+        player = self.current_player
+        team = self.team(self.current_team)
+        price = self.current_bid
+
+        self.players.mark_sold(player.id, team['name'], price)
+        team['players'].append(player.id)
+        team['purse'] = round(team['purse'] - price, 2)
+        self._standings[team['id']].add(player.role, self._lot_kind[1], team['purse'])
+        self.refresh_eligibility(team)
+        self.ledger.record_sale(player, team['id'], price)
+
+        self._close_lot()
+        self._emit({'type': 'hammer', 'player': player.id, 'team': team['id'], 'price': price})
+        return player, team, price
+
+    def pass_lot(self):
+        """Close the current lot without a sale and return the player."""
+        if self.current_player is None:
+            raise AuctionError("No player is under the hammer")
+
+        player = self.current_player
+        self.players.mark_unsold(player.id)
+        self.ledger.record_pass(player)
+        self._close_lot()
+        self._emit({'type': 'pass', 'player': player.id})
+        return player
+
+    def apply(self, event):
+        """Replay one event produced by this engine (or an identical one)."""
+        kind = event['type']
+        if kind == 'lot_opened':
+            self.open_lot(event['player'])
+        elif kind == 'proxy':
+            self._register_proxy(event['team'], event['max_bid'])
+        elif kind == 'bid':
+            # Proxy answers were journaled as bids of their own, so nothing is resolved here
+            self._bid(event['team'], proxy=event.get('proxy', False))
+            if self.current_bid != event['amount']:
+                raise AuctionError(f"Replayed bid came to ₹{self.current_bid}, journal says ₹{event['amount']}")
+        elif kind == 'hammer':
+            _, team, price = self.hammer()
+            if (team['id'], price) != (event['team'], event['price']):
+                raise AuctionError(f"Replayed sale went to {team['id']} for ₹{price}, journal disagrees")
+        elif kind == 'pass':
+            self.pass_lot()
+        else:
+            raise AuctionError(f"Unknown event type: {kind}")
+
+    def state(self):
+        """Compact, JSON-serializable summary of everything that has happened so far.
+
+        Bids that were outbid are not kept; `restore` rebuilds the same
+        squads, purses, ledger and open lot from the lots and their outcomes.
+        """
+        sales = {player_id: [team_id, price] for player_id, team_id, price in self.ledger.transactions}
+        current = None
+        if self.current_player is not None:
+            current = [self.current_player.id, self.current_bid, self.current_team, self._proxies]
+        return {'drawn': list(self._drawn), 'sales': sales, 'current': current}
+
+    def restore(self, state):
+        """Bring a freshly created engine to a state captured by `state()`.
+
+        Listeners are not notified, since these changes are already recorded.
+        """
+        listeners, self._listeners = self._listeners, []
+        try:
+            # JSON turns the integer player ids used as keys into strings
+            sales = {int(player_id): sale for player_id, sale in state['sales'].items()}
+            current = state['current']
+            for player_id in state['drawn']:
+                self.open_lot(player_id)
+                if player_id in sales:
+                    self.current_team, self.current_bid = sales[player_id]
+                    self.hammer()
+                elif current and player_id == current[0]:
+                    self.current_bid, self.current_team = current[1], current[2]
+                    # Snapshots from before proxy bidding have no proxies entry
+                    for team_id, (max_bid, order) in (current[3] if len(current) > 3 else {}).items():
+                        self._proxies[team_id] = (max_bid, order)
+                    self._proxy_count = max((order for _, order in self._proxies.values()), default=0)
+                else:
+                    self.pass_lot()
+        finally:
+            self._listeners = listeners
+
+    def _close_lot(self):
+        self.current_player = None
+        self.current_bid = 0
+        self.current_team = None
+        self._lot_kind = None
+        self._proxies = {}
+        self._proxy_count = 0
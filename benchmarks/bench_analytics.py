@@ -0,0 +1,83 @@
+"""Cross-auction analytics over many completed auction journals.
+
+Runs `--auctions` small auctions with random bidding, journaled into a
+temporary directory, then times loading every sale into one table (reading
+the journals directly, and by replaying each auction for comparison on the
+first `--replay` of them) and each analysis over it.
+
+    python -m benchmarks.bench_analytics --auctions 2000 --players 100
+"""
+import argparse
+import random
+import tempfile
+import time
+
+import numpy as np
+
+import analytics
+from auction_engine import AuctionEngine
+from benchmarks.bench_engine import make_teams
+from benchmarks.suite import drive
+from export import results_frame
+from journal import AuctionJournal, completed_auctions, recover
+from players import generate_players
+
+
+def write_auctions(root, count, teams, players, seed):
+    for i in range(count):
+        engine = AuctionEngine(make_teams(teams, purse=90.0), generate_players(players, seed + i), max_squad_size=15,
+                               rng=random.Random(seed + i))
+        # Only fsync at the end: these journals are thrown away
+        journal = AuctionJournal.create(engine, root=root, sync_every=10**9, sync_interval=float('inf'))
+        drive(engine, seed + i)
+        journal.mark_complete()
+        journal.close()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--auctions', type=int, default=2_000)
+    parser.add_argument('--teams', type=int, default=8)
+    parser.add_argument('--players', type=int, default=100)
+    parser.add_argument('--replay', type=int, default=100, help="Auctions to also load by replaying their journals")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        elapsed, _ = timed(lambda: write_auctions(root, args.auctions, args.teams, args.players, args.seed))
+        directories = completed_auctions(root)
+        print(f"{len(directories)} auctions written in {elapsed:.1f} s")
+
+        elapsed, sales = timed(lambda: analytics.load_journals(directories))
+        print(f"load journals   {elapsed * 1000:9.1f} ms  {len(sales):>9} sales  "
+              f"{sales.memory_usage(deep=True).sum() / 1e6:.1f} MB")
+
+        replayed = directories[:args.replay]
+        elapsed, frames = timed(lambda: [results_frame(recover(d)[0]) for d in replayed])
+        per_auction = elapsed / max(1, len(replayed))
+        print(f"replay instead  {per_auction * len(directories) * 1000:9.1f} ms  "
+              f"(estimated from {len(replayed)} auctions)")
+        direct = analytics.load_journals(replayed)
+        assert len(direct) == sum(len(f) for f in frames)
+        assert np.isclose(direct['price'].sum(), sum(f['Price (crores)'].sum() for f in frames))
+
+        elapsed, rated = timed(lambda: analytics.value_for_money(sales))
+        print(f"value for money {elapsed * 1000:9.1f} ms")
+        for label, fn in [
+            ('spend by role', lambda: analytics.spend_by(sales, 'role')),
+            ('spend by country', lambda: analytics.spend_by(sales, 'country')),
+            ('inflation', lambda: analytics.inflation_by_band(sales)),
+            ('team strategies', lambda: analytics.strategy_summary(analytics.team_strategies(rated))),
+        ]:
+            elapsed, _ = timed(fn)
+            print(f"{label:<15} {elapsed * 1000:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Throughput of the headless auction engine.
+
+Runs a scripted auction (random bidding wars, occasional unsold lots) and
+reports bids and lots handled per second.
+
+    python -m benchmarks.bench_engine --players 100000 --teams 300
+"""
+import argparse
+import random
+import time
+
+from auction_engine import AuctionEngine
+from players import generate_sample_players
+
+
+def make_teams(count, purse):
+    return [{
+        'id': f"team-{i}",
+        'name': f"Team {i+1}",
+        'purse': purse,
+        'original_purse': purse,
+        'players': [],
+        'can_bid': True
+    } for i in range(count)]
+
+
+def run(players, teams, squad_size, max_lots, seed=0):
+    rng = random.Random(seed)
+    engine = AuctionEngine(make_teams(teams, purse=90.0), generate_sample_players(players, rng=rng),
+                           max_squad_size=squad_size, rng=rng)
+    team_ids = [t['id'] for t in engine.teams]
+
+    bids = lots = 0
+    bid_time = lot_time = 0.0
+    while lots < max_lots and not engine.is_complete():
+        start = time.perf_counter()
+        engine.next_lot()
+        lot_time += time.perf_counter() - start
+
+        # A short bidding war between a handful of random teams
+        bidders = rng.sample(team_ids, min(4, len(team_ids)))
+        for _ in range(rng.randint(0, 12)):
+            team_id = rng.choice(bidders)
+            if not engine.can_bid(team_id):
+                continue
+            start = time.perf_counter()
+            engine.place_bid(team_id)
+            bid_time += time.perf_counter() - start
+            bids += 1
+
+        start = time.perf_counter()
+        if engine.current_team is not None:
+            engine.hammer()
+        else:
+            engine.pass_lot()
+        lot_time += time.perf_counter() - start
+        lots += 1
+
+    return {
+        'bids': bids,
+        'lots': lots,
+        'bids_per_sec': bids / bid_time if bid_time else float('inf'),
+        'lots_per_sec': lots / lot_time if lot_time else float('inf'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=100_000)
+    parser.add_argument('--teams', type=int, default=300)
+    parser.add_argument('--squad-size', type=int, default=15)
+    parser.add_argument('--max-lots', type=int, default=2_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    result = run(args.players, args.teams, args.squad_size, args.max_lots, args.seed)
+    print(f"players={args.players} teams={args.teams} squad_size={args.squad_size}")
+    print(f"  {result['bids']:>8} bids  {result['bids_per_sec']:>12,.0f} bids/sec")
+    print(f"  {result['lots']:>8} lots  {result['lots_per_sec']:>12,.0f} lots/sec")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Sample pool generation: the old per-player loop, the vectorized generator, and a cached snapshot.
+
+    python -m benchmarks.bench_generator --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from players import BASE_PRICES, PLAYER_COUNTRIES, PLAYER_ROLES, PlayerStore, cached_players, generate_players
+
+
+def loop_generator(count, rng):
+    # generate_sample_players() before it was vectorized
+    store = PlayerStore(capacity=count)
+    names, roles, countries, prices, batting, bowling, matches = [], [], [], [], [], [], []
+    for i in range(count):
+        names.append(f"Player {i+1}")
+        roles.append(store.role_code(rng.choice(PLAYER_ROLES)))
+        countries.append(store.country_code(rng.choice(PLAYER_COUNTRIES)))
+        prices.append(rng.choice(BASE_PRICES))
+        batting.append(round(rng.uniform(20, 60), 1))
+        bowling.append(round(rng.uniform(18, 40), 1))
+        matches.append(rng.randint(10, 200))
+    store.extend(names, roles, countries, prices, batting, bowling, matches)
+    return store
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache:
+        for size in args.sizes:
+            loop = timed(lambda: loop_generator(size, random.Random(args.seed)))
+            vectorized = timed(lambda: generate_players(size, args.seed))
+            cold = timed(lambda: cached_players(size, args.seed, directory=cache))
+            warm = timed(lambda: cached_players(size, args.seed, directory=cache))
+            print(f"players={size:>9}  loop {loop * 1000:9.1f} ms  vectorized {vectorized * 1000:8.1f} ms  "
+                  f"snapshot write {cold * 1000:8.1f} ms  snapshot load {warm * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Player import throughput for large CSV and Parquet files.
+
+Writes a synthetic player file of the requested size to a temporary
+directory, then times `import_players` on it in each supported mode.
+
+    python -m benchmarks.bench_import --rows 2000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from player_import import import_players
+from players import BASE_PRICES, PLAYER_COUNTRIES, PLAYER_ROLES
+
+
+def make_frame(rows, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'name': [f"Player {i+1}" for i in range(rows)],
+        'role': np.array(PLAYER_ROLES)[rng.integers(len(PLAYER_ROLES), size=rows)],
+        'country': np.array(PLAYER_COUNTRIES)[rng.integers(len(PLAYER_COUNTRIES), size=rows)],
+        'base_price': np.array(BASE_PRICES)[rng.integers(len(BASE_PRICES), size=rows)],
+        'batting_avg': rng.uniform(20, 60, size=rows).round(1),
+        'bowling_avg': rng.uniform(18, 40, size=rows).round(1),
+        'matches_played': rng.integers(10, 201, size=rows),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        frame = make_frame(args.rows, args.seed)
+        paths = {'csv': os.path.join(tmp, 'players.csv'), 'parquet': os.path.join(tmp, 'players.parquet')}
+        frame.to_csv(paths['csv'], index=False)
+        frame.to_parquet(paths['parquet'], index=False)
+        del frame
+
+        print(f"rows={args.rows} chunk_size={args.chunk_size}")
+        for file_format, path in paths.items():
+            size_mb = os.path.getsize(path) / 1e6
+            for memory_map in (False, True):
+                start = time.perf_counter()
+                store, report = import_players(path, chunk_size=args.chunk_size, memory_map=memory_map)
+                elapsed = time.perf_counter() - start
+                assert report['imported'] == args.rows
+                label = f"{file_format}{' (mmap)' if memory_map else ''}"
+                print(f"  {label:<16} {size_mb:>7.1f} MB  {elapsed:>6.2f} s  "
+                      f"{args.rows / elapsed:>12,.0f} rows/sec  {size_mb / elapsed:>7.1f} MB/s")
+                del store
+
+
+if __name__ == '__main__':
+    main()
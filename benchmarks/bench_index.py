@@ -0,0 +1,67 @@
+"""Pool queries through `PlayerIndex` against a boolean scan of every column.
+
+Builds the index once per size, then runs a few typical pool-browser
+queries both ways and checks they return the same players.
+
+    python -m benchmarks.bench_index --sizes 100000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from player_index import PlayerIndex
+from players import generate_players
+
+QUERIES = {
+    'one role': {'roles': ['Wicket-keeper']},
+    'role + country': {'roles': ['Bowler'], 'countries': ['India']},
+    'marquee': {'base_price': (2.0, None)},
+    'top batsmen': {'roles': ['Batsman'], 'batting_avg': (55, None), 'matches_played': (150, None)},
+    'narrow stats': {'batting_avg': (30, 31), 'bowling_avg': (20, 22)},
+}
+
+
+def scan(store, roles=None, countries=None, **ranges):
+    mask = np.ones(len(store), dtype=bool)
+    if roles is not None:
+        mask &= np.isin(store.column('role'), [store.roles.index(r) for r in roles])
+    if countries is not None:
+        mask &= np.isin(store.column('country'), [store.countries.index(c) for c in countries])
+    for column, (low, high) in ranges.items():
+        values = store.column(column)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+    return np.flatnonzero(mask)
+
+
+def best_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        store = generate_players(size, seed=0)
+        build, index = best_ms(lambda: PlayerIndex(store), 1)
+        print(f"players={size:>9}  index build {build:8.1f} ms  {index.nbytes / 1e6:6.1f} MB")
+        for label, filters in QUERIES.items():
+            indexed, ids = best_ms(lambda: index.query(**filters), args.repeat)
+            scanned, expected = best_ms(lambda: scan(store, **filters), args.repeat)
+            assert np.array_equal(ids, expected)
+            print(f"  {label:<16} {len(ids):>9} players  index {indexed:7.2f} ms  scan {scanned:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
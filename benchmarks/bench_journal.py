@@ -0,0 +1,93 @@
+"""Cost of journaling auction events, and how long recovery takes.
+
+Runs the same scripted auction with and without an `AuctionJournal` attached
+and reports the overhead per event, then recovers the journaled auction from
+disk with and without snapshots.
+
+    python -m benchmarks.bench_journal --players 100000 --teams 300 --max-lots 20000
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from auction_engine import AuctionEngine
+from benchmarks.bench_engine import make_teams
+from journal import AuctionJournal, recover
+from players import generate_sample_players
+
+
+def script(engine, rng, max_lots):
+    """Drive `engine` through random bidding wars; returns the number of events emitted."""
+    team_ids = [t['id'] for t in engine.teams]
+    events = lots = 0
+    while lots < max_lots and not engine.is_complete():
+        engine.next_lot()
+        bidders = rng.sample(team_ids, min(4, len(team_ids)))
+        for _ in range(rng.randint(0, 12)):
+            team_id = rng.choice(bidders)
+            if engine.can_bid(team_id):
+                engine.place_bid(team_id)
+                events += 1
+        if engine.current_team is not None:
+            engine.hammer()
+        else:
+            engine.pass_lot()
+        events += 2
+        lots += 1
+    return events
+
+
+def timed_run(players, teams, squad_size, max_lots, seed, root=None, snapshot_every=None):
+    rng = random.Random(seed)
+    engine = AuctionEngine(make_teams(teams, purse=90.0), players.copy(), max_squad_size=squad_size, rng=rng)
+    journal = None
+    if root is not None:
+        options = {'snapshot_every': snapshot_every} if snapshot_every else {}
+        journal = AuctionJournal.create(engine, root=root, **options)
+
+    start = time.perf_counter()
+    events = script(engine, rng, max_lots)
+    if journal is not None:
+        journal.close()
+    return engine, journal, events, time.perf_counter() - start
+
+
+def timed_recovery(directory):
+    start = time.perf_counter()
+    engine, journal = recover(directory)
+    elapsed = time.perf_counter() - start
+    journal.close()
+    return engine, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=100_000)
+    parser.add_argument('--teams', type=int, default=300)
+    parser.add_argument('--squad-size', type=int, default=15)
+    parser.add_argument('--max-lots', type=int, default=20_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    players = generate_sample_players(args.players, rng=random.Random(args.seed))
+    run = (players, args.teams, args.squad_size, args.max_lots, args.seed)
+    print(f"players={args.players} teams={args.teams} squad_size={args.squad_size} max_lots={args.max_lots}")
+
+    _, _, events, plain = timed_run(*run)
+    with tempfile.TemporaryDirectory() as root:
+        # Snapshots never come due in the first run, so its recovery replays the whole journal
+        live, full, _, journaled = timed_run(*run, root=root, snapshot_every=events + 1)
+        _, snapshotted, _, _ = timed_run(*run, root=root)
+
+        print(f"  {events:>8} events  {plain / events * 1e6:8.2f} us/event plain  "
+              f"{journaled / events * 1e6:8.2f} us/event journaled  "
+              f"(+{(journaled - plain) / events * 1e6:.2f} us)")
+        for label, journal in [('full replay', full), ('from snapshot', snapshotted)]:
+            engine, elapsed = timed_recovery(journal.directory)
+            assert engine.state() == live.state(), "recovered auction differs from the live one"
+            print(f"  recovery ({label:<13}) {elapsed * 1000:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Bytes per player: the old list-of-dicts layout against `PlayerStore`.
+
+Both layouts are built from the same generated values and measured with
+tracemalloc. The values (including the name strings) are created up front
+and shared, so each layout is only charged for the structure around them.
+
+    python -m benchmarks.bench_memory --players 100000
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+import uuid
+
+from players import BASE_PRICES, PLAYER_COUNTRIES, PLAYER_ROLES, PlayerStore
+
+
+def sample_values(count, seed):
+    rng = random.Random(seed)
+    return [(
+        f"Player {i+1}",
+        rng.choice(PLAYER_ROLES),
+        rng.choice(PLAYER_COUNTRIES),
+        rng.choice(BASE_PRICES),
+        round(rng.uniform(20, 60), 1),
+        round(rng.uniform(18, 40), 1),
+        rng.randint(10, 200),
+    ) for i in range(count)]
+
+
+def build_dicts(values):
+    # The layout generate_sample_players() used to produce
+    return [{
+        'id': str(uuid.uuid4()),
+        'name': name,
+        'role': role,
+        'country': country,
+        'base_price': price,
+        'stats': {
+            'batting_avg': batting,
+            'bowling_avg': bowling,
+            'matches_played': matches
+        },
+        'status': 'unsold'
+    } for name, role, country, price, batting, bowling, matches in values]
+
+
+def build_store(values):
+    store = PlayerStore(capacity=len(values))
+    names, roles, countries, prices, batting, bowling, matches = zip(*values)
+    store.extend(list(names), [store.role_code(r) for r in roles], [store.country_code(c) for c in countries],
+                 prices, batting, bowling, matches)
+    return store
+
+
+def measure(build, values):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(values)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    values = sample_values(args.players, args.seed)
+    dict_bytes = measure(build_dicts, values)
+    store_bytes = measure(build_store, values)
+
+    print(f"players={args.players}")
+    print(f"  list of dicts  {dict_bytes / args.players:>8.1f} bytes/player")
+    print(f"  PlayerStore    {store_bytes / args.players:>8.1f} bytes/player")
+    print(f"  reduction      {dict_bytes / store_bytes:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
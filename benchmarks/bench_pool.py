@@ -0,0 +1,56 @@
+"""Lot selection latency as the remaining pool grows.
+
+Compares drawing from `RemainingPool` with the old approach of sorting the
+whole pool by base price and filtering the chosen player out on every lot.
+
+    python -m benchmarks.bench_pool --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import random
+import time
+
+from auction_engine import TOP_K
+from player_pool import RemainingPool
+from players import BASE_PRICES
+
+
+def make_pool(size, rng):
+    return [(i, rng.choice(BASE_PRICES)) for i in range(size)]
+
+
+def sort_and_filter(players, rng, lots):
+    start = time.perf_counter()
+    for _ in range(lots):
+        sorted_players = sorted(players, key=lambda x: x[1], reverse=True)
+        player_id, _ = sorted_players[rng.randint(0, min(TOP_K - 1, len(sorted_players) - 1))]
+        players = [p for p in players if p[0] != player_id]
+    return (time.perf_counter() - start) / lots
+
+
+def indexed_pool(players, rng, lots):
+    pool = RemainingPool(players)
+    start = time.perf_counter()
+    for _ in range(lots):
+        pool.draw(rng, TOP_K)
+    return (time.perf_counter() - start) / lots
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--lots', type=int, default=1_000)
+    parser.add_argument('--legacy-lots', type=int, default=20,
+                        help="lots to time for the sort-and-filter baseline, which is much slower")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'players':>10} {'sort+filter':>14} {'RemainingPool':>14}")
+    for size in args.sizes:
+        players = make_pool(size, random.Random(args.seed))
+        legacy = sort_and_filter(players, random.Random(args.seed), min(args.legacy_lots, size))
+        indexed = indexed_pool(players, random.Random(args.seed), min(args.lots, size))
+        print(f"{size:>10} {legacy * 1e6:>11,.1f} us {indexed * 1e6:>11,.2f} us")
+
+
+if __name__ == '__main__':
+    main()
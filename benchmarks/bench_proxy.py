@@ -0,0 +1,71 @@
+"""Proxy bid resolution: closed form over the increment ladder against stepping raise by raise.
+
+Two teams register max bids on one lot, `--gap` crores apart. The stepping
+version asks every proxy for an answer after each raise, the way a naive
+auto-bidder would; `set_proxy` works out the final price from the ladder
+first. Both place the same implied bids, so the difference is the deciding.
+
+    python -m benchmarks.bench_proxy --limits 10 100 1000 --proxies 2 20
+"""
+import argparse
+import random
+import time
+
+from auction_engine import AuctionEngine, ladder_steps
+from benchmarks.bench_engine import make_teams
+from players import generate_players
+
+
+def open_lot(teams, purse):
+    engine = AuctionEngine(make_teams(teams, purse=purse), generate_players(10), max_squad_size=5,
+                           rng=random.Random(0))
+    engine.next_lot()
+    return engine
+
+
+def stepping(engine, limits):
+    # After every raise, each proxy checks whether it can answer; the highest limit does
+    while True:
+        best = None
+        for team_id, limit in limits.items():
+            if team_id == engine.current_team or not engine.can_bid(team_id):
+                continue
+            steps = ladder_steps(engine.current_bid, min(limit, engine.team(team_id)['purse']))
+            if steps and (best is None or steps > best[0]):
+                best = (steps, team_id)
+        if best is None:
+            return
+        engine._bid(best[1], proxy=True)
+
+
+def closed_form(engine, limits):
+    for team_id, limit in limits.items():
+        engine.set_proxy(team_id, limit)
+
+
+def timed(fn, proxies, limit):
+    engine = open_lot(proxies, purse=limit * 2)
+    # Limits spread just under `limit`, so the top two fight all the way up
+    limits = {t['id']: round(limit - i * 0.5, 2) for i, t in enumerate(engine.teams)}
+    start = time.perf_counter()
+    fn(engine, limits)
+    return time.perf_counter() - start, engine.ledger.bid_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--limits', type=float, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--proxies', type=int, nargs='+', default=[2, 20])
+    args = parser.parse_args()
+
+    for proxies in args.proxies:
+        for limit in args.limits:
+            step_time, bids = timed(stepping, proxies, limit)
+            closed_time, closed_bids = timed(closed_form, proxies, limit)
+            assert bids == closed_bids
+            print(f"proxies={proxies:>3}  limit ₹{limit:>7g} cr  {bids:>6} implied bids  "
+                  f"stepping {step_time * 1000:8.2f} ms  closed form {closed_time * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""Load test for shared auction rooms.
+
+Stands in for many browser sessions with threads: in each of `--rooms`
+rooms an auctioneer thread opens lots and brings the hammer down once the
+bidding has been quiet for `--quiet` seconds, while `--bidders` bidder
+threads spread over all rooms keep raising the price, up to a random limit
+per player, with the room version they last saw. Reports bid latency
+percentiles (including time spent waiting on the room lock), how long
+waiting sessions take to wake after a change, and how many bids were
+rejected as stale.
+
+    python -m benchmarks.bench_rooms --rooms 40 --bidders 400 --duration 10
+"""
+import argparse
+import random
+import threading
+import time
+
+import numpy as np
+
+from auction_engine import AuctionEngine, AuctionError
+from benchmarks.bench_engine import make_teams
+from players import generate_sample_players
+from rooms import RoomRegistry, StaleActionError
+
+PERCENTILES = [50, 90, 99, 99.9]
+
+
+def auctioneer(room, quiet, stop):
+    while not stop.is_set() and room.next_lot() is not None:
+        seen = room.version
+        # Every bid restarts the countdown; a full quiet period closes the lot
+        while room.wait(seen, timeout=quiet) != seen:
+            seen = room.version
+        try:
+            if room.engine.current_team is not None:
+                room.hammer(seen)
+            else:
+                room.pass_lot(seen)
+        except StaleActionError:
+            pass  # A bid slipped in at the last moment; keep counting down
+
+
+def bidder(room, team_id, think, stop, seed, stats):
+    rng = random.Random(seed)
+    latencies, stale, rejected = [], 0, 0
+    limits = {}  # Player id -> the most this bidder will pay for them
+    while not stop.is_set() and not room.engine.is_complete():
+        seen = room.version
+        time.sleep(rng.uniform(0, think))
+        player = room.engine.current_player
+        if player is None or room.engine.current_team == team_id:
+            room.wait(seen, timeout=think)
+            continue
+        if room.engine.next_bid_amount() > limits.setdefault(player.id, player.base_price * rng.uniform(1, 3)):
+            room.wait(seen, timeout=think)
+            continue
+        start = time.perf_counter()
+        try:
+            room.bid(team_id, seen)
+        except StaleActionError:
+            stale += 1
+        except AuctionError:
+            rejected += 1
+        latencies.append(time.perf_counter() - start)
+    stats.append((latencies, stale, rejected))
+
+
+def watcher(room, stop, stamps, wakeups):
+    """A session that only follows the room, like a spectator's page."""
+    seen = room.version
+    while not stop.is_set() and not room.engine.is_complete():
+        version = room.wait(seen, timeout=0.5)
+        if version != seen:
+            wakeups.append(time.perf_counter() - stamps[room.id])
+            seen = version
+
+
+def run(rooms, bidders, teams, players, squad_size, duration, think, quiet, watchers, seed=0):
+    rng = random.Random(seed)
+    registry = RoomRegistry()
+    pool = generate_sample_players(players, rng=rng)
+    stamps = {}
+
+    opened = []
+    for _ in range(rooms):
+        room = registry.open(AuctionEngine(make_teams(teams, purse=90.0), pool.copy(), max_squad_size=squad_size,
+                                           rng=random.Random(rng.random())))
+        # Time of the latest event in each room, for measuring how fast waiting sessions wake
+        room.engine.subscribe(lambda event, room_id=room.id: stamps.__setitem__(room_id, time.perf_counter()))
+        stamps[room.id] = time.perf_counter()
+        opened.append(room)
+
+    stop = threading.Event()
+    stats, wakeups = [], []
+    threads = [threading.Thread(target=auctioneer, args=(room, quiet, stop)) for room in opened]
+    for i in range(bidders):
+        room = opened[i % rooms]
+        team_id = room.engine.teams[(i // rooms) % teams]['id']
+        threads.append(threading.Thread(target=bidder, args=(room, team_id, think, stop, rng.random(), stats)))
+    for i in range(watchers * rooms):
+        threads.append(threading.Thread(target=watcher, args=(opened[i % rooms], stop, stamps, wakeups)))
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = np.concatenate([np.asarray(l, dtype=np.float64) for l, _, _ in stats])
+    return {
+        'elapsed': elapsed,
+        'bids': int(len(latencies)),
+        'stale': sum(s for _, s, _ in stats),
+        'rejected': sum(r for _, _, r in stats),
+        'lots': sum(room.engine.ledger.sold_count + room.engine.ledger.passed_count for room in opened),
+        'latency': dict(zip(PERCENTILES, np.percentile(latencies, PERCENTILES))) if len(latencies) else {},
+        'wakeup': dict(zip(PERCENTILES, np.percentile(wakeups, PERCENTILES))) if wakeups else {},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rooms', type=int, default=40)
+    parser.add_argument('--bidders', type=int, default=400)
+    parser.add_argument('--teams', type=int, default=10)
+    parser.add_argument('--players', type=int, default=2_000)
+    parser.add_argument('--squad-size', type=int, default=15)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--think', type=float, default=0.2, help="Max seconds a bidder waits before bidding")
+    parser.add_argument('--quiet', type=float, default=0.3, help="Seconds without a bid before the hammer falls")
+    parser.add_argument('--watchers', type=int, default=2, help="Spectating sessions per room")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    result = run(args.rooms, args.bidders, args.teams, args.players, args.squad_size, args.duration,
+                 args.think, args.quiet, args.watchers, args.seed)
+    attempts = result['bids']
+    print(f"rooms={args.rooms} bidders={args.bidders} watchers={args.watchers * args.rooms} "
+          f"duration={result['elapsed']:.1f}s")
+    print(f"  {attempts:>8} bid attempts  {attempts / result['elapsed']:10,.0f} /sec  "
+          f"stale {result['stale'] / max(attempts, 1):.1%}  rejected {result['rejected'] / max(attempts, 1):.1%}")
+    print(f"  {result['lots']:>8} lots closed")
+    for label, key in [('bid latency', 'latency'), ('push wakeup', 'wakeup')]:
+        print(f"  {label:<12} " + "  ".join(f"p{p:g} {v * 1000:7.2f} ms" for p, v in result[key].items()))
+
+
+if __name__ == '__main__':
+    main()
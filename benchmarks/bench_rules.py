@@ -0,0 +1,92 @@
+"""Squad-rule bid checks: precomputed per-team limits against rescanning each squad.
+
+Fills every squad part way under a full set of rules (minimum squad, role
+quotas, overseas cap), opens a lot, and times one bid check per team - what
+the auction screen does for its row of bid buttons - both as the engine's
+lookup and by recounting roles and overseas players from the squad.
+
+    python -m benchmarks.bench_rules --teams 10 300 --squad-size 25
+"""
+import argparse
+import random
+import time
+from collections import Counter
+
+from auction_engine import AuctionEngine
+from benchmarks.bench_engine import make_teams
+from players import generate_players
+from squad_rules import SquadRules
+
+RULES = {'min_squad_size': 18, 'role_quotas': {'Wicket-keeper': (1, 3), 'Bowler': (5, None), 'Batsman': (4, 10)},
+         'max_overseas': 8, 'home_country': 'India'}
+
+
+def scan_limit(engine, team, player):
+    # The same answer as engine.max_bid, recounted from the squad every time
+    rules = engine.rules
+    squad = engine.squad(team)
+    size = len(squad)
+    if size >= rules.max_squad_size:
+        return None
+    roles = Counter(p.role for p in squad)
+    overseas = sum(rules.is_overseas(p.country) for p in squad)
+    low, high = rules.role_quotas.get(player.role, (0, None))
+    if high is not None and roles[player.role] >= high:
+        return None
+    if rules.is_overseas(player.country) and rules.max_overseas is not None and overseas >= rules.max_overseas:
+        return None
+    unmet = sum(max(0, l - roles[r]) for r, (l, _) in rules.role_quotas.items()) - (roles[player.role] < low)
+    if rules.max_squad_size - size - 1 < unmet:
+        return None
+    return round(team['purse'] - max(rules.min_squad_size - size - 1, unmet) * engine.min_bid, 2)
+
+
+def filled_engine(teams, squad_size, seed):
+    rng = random.Random(seed)
+    rules = SquadRules(squad_size, **RULES)
+    engine = AuctionEngine(make_teams(teams, purse=1000.0), generate_players(teams * squad_size * 8, seed),
+                           rules=rules, rng=rng)
+    team_ids = [t['id'] for t in engine.teams]
+    while engine.ledger.sold_count < teams * squad_size // 2 and not engine.is_complete():
+        engine.next_lot()
+        bidders = [t for t in team_ids if engine.can_bid(t)]
+        if bidders:
+            engine.place_bid(rng.choice(bidders))
+            engine.hammer()
+        else:
+            engine.pass_lot()
+    engine.next_lot()
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teams', type=int, nargs='+', default=[10, 300])
+    parser.add_argument('--squad-size', type=int, default=25)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for teams in args.teams:
+        engine = filled_engine(teams, args.squad_size, args.seed)
+        player = engine.current_player
+        assert all(engine.max_bid(t['id']) == scan_limit(engine, t, player) for t in engine.teams)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for team in engine.teams:
+                engine.can_bid(team['id'])
+        lookup = (time.perf_counter() - start) / args.repeat
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for team in engine.teams:
+                scan_limit(engine, team, player)
+        scan = (time.perf_counter() - start) / args.repeat
+
+        print(f"teams={teams:>5}  {engine.ledger.sold_count:>6} players in squads  "
+              f"lookup {lookup * 1000:8.3f} ms  rescan {scan * 1000:8.3f} ms per row of bid checks")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""Monte Carlo simulator throughput against the number of worker processes.
+
+    python -m benchmarks.bench_simulator --runs 2000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import time
+
+from simulator import simulate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=1_000)
+    parser.add_argument('--teams', type=int, default=8)
+    parser.add_argument('--players', type=int, default=200)
+    parser.add_argument('--squad-size', type=int, default=15)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    teams = [(f"Team {i+1}", 90.0) for i in range(args.teams)]
+    print(f"runs={args.runs} teams={args.teams} players={args.players} cpus={os.cpu_count()}")
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        simulate(args.runs, teams, max_squad_size=args.squad_size, player_count=args.players, workers=workers)
+        rate = args.runs / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print(f"  workers={workers:<3} {rate:>8,.1f} auctions/sec  speedup {rate / baseline:4.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Lots per minute through the real Streamlit UI.
+
+Drives app.py with Streamlit's AppTest harness: each lot is one bid click
+followed by a SOLD! click, so the number includes every rerun the UI does
+between the hammer and the next lot being on screen.
+
+    python -m benchmarks.bench_ui_lots --lots 20
+"""
+import argparse
+import os
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from auction_engine import AuctionEngine
+from benchmarks.bench_engine import make_teams
+from players import generate_sample_players
+from rooms import rooms
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+
+def click(at, key):
+    next(b for b in at.button if b.key == key).click().run()
+    assert not at.exception, at.exception
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lots', type=int, default=20)
+    args = parser.parse_args()
+
+    # Start on the auction stage directly, as the Start Auction button would
+    at = AppTest.from_file(APP, default_timeout=120)
+    room = rooms.open(AuctionEngine(make_teams(3, purse=90.0), generate_sample_players(max(100, args.lots))))
+    at.session_state['room'] = room
+    at.session_state['engine'] = room.engine
+    at.session_state['app_stage'] = 'auction'
+    at.run()
+
+    start = time.perf_counter()
+    for _ in range(args.lots):
+        team_key = next(b.key for b in at.button if b.key and b.key.startswith('bid_'))
+        click(at, team_key)
+        click(at, 'sold_button')
+    elapsed = time.perf_counter() - start
+
+    print(f"lots={args.lots}  {args.lots / elapsed * 60:,.1f} lots/min  "
+          f"{elapsed / args.lots * 1000:,.1f} ms per lot")
+
+
+if __name__ == '__main__':
+    main()
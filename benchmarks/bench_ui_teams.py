@@ -0,0 +1,50 @@
+"""Auction page rerun time as the number of teams grows.
+
+Renders the auction screen through Streamlit's AppTest harness for each
+team count and times a bid click plus a SOLD! click, the two reruns every
+lot goes through. With paging, only one page of teams is drawn per rerun,
+so the time should stay roughly flat.
+
+    python -m benchmarks.bench_ui_teams --teams 10 100 500 --lots 10
+"""
+import argparse
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from auction_engine import AuctionEngine
+from benchmarks.bench_engine import make_teams
+from benchmarks.bench_ui_lots import APP, click
+from players import generate_sample_players
+from rooms import rooms
+
+
+def rerun_time(teams, lots):
+    at = AppTest.from_file(APP, default_timeout=120)
+    room = rooms.open(AuctionEngine(make_teams(teams, purse=90.0), generate_sample_players(max(100, lots))))
+    at.session_state['room'] = room
+    at.session_state['engine'] = room.engine
+    at.session_state['app_stage'] = 'auction'
+    at.run()
+
+    start = time.perf_counter()
+    for _ in range(lots):
+        team_key = next(b.key for b in at.button if b.key and b.key.startswith('bid_'))
+        click(at, team_key)
+        click(at, 'sold_button')
+    return (time.perf_counter() - start) / (lots * 2), len(at.button)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teams', type=int, nargs='+', default=[10, 100, 500])
+    parser.add_argument('--lots', type=int, default=10)
+    args = parser.parse_args()
+
+    for teams in args.teams:
+        elapsed, buttons = rerun_time(teams, args.lots)
+        print(f"teams={teams:>5}  {elapsed * 1000:8.1f} ms per rerun  {buttons:>4} buttons on screen")
+
+
+if __name__ == '__main__':
+    main()
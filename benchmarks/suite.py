@@ -0,0 +1,245 @@
+"""Benchmark suite with saved baselines and regression checks.
+
+Runs every combination of `--players` x `--teams` x `--squad-size` and
+measures, for each:
+
+- engine hot paths: lot selection, a bid, the hammer (median per call)
+- results aggregation and the full export build, on a completed auction
+- memory held by the engine, and peak allocation while building it
+- full-page render time of the setup, auction and results stages through
+  Streamlit's AppTest harness
+
+Every timing is the best of `--repeat` runs, to keep noise out of the
+comparison. `--save` writes the results as a JSON baseline; `--compare`
+checks a fresh run against one and exits with status 1 if any metric got
+worse by more than `--threshold`.
+
+    python -m benchmarks.suite --players 1000 100000 --teams 10 300 --save benchmarks/baselines/local.json
+    python -m benchmarks.suite --compare benchmarks/baselines/local.json --threshold 0.2
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from streamlit.testing.v1 import AppTest
+
+from auction_engine import AuctionEngine
+from benchmarks.bench_engine import make_teams
+from benchmarks.bench_ui_lots import APP
+from export import build_export, results_frame
+from players import generate_sample_players
+from rooms import AuctionRoom
+
+RENDER_RERUNS = 5
+DEFAULT_PLAYERS = [1_000, 100_000]
+DEFAULT_TEAMS = [10, 300]
+DEFAULT_SQUAD_SIZES = [15]
+DEFAULT_THRESHOLD = 0.2  # 20% slower (or bigger) than the baseline counts as a regression
+
+
+def config_key(players, teams, squad_size):
+    return f"players={players},teams={teams},squad_size={squad_size}"
+
+
+def build_engine(players, teams, squad_size, seed):
+    rng = random.Random(seed)
+    return AuctionEngine(make_teams(teams, purse=90.0), generate_sample_players(players, rng=rng),
+                         max_squad_size=squad_size, rng=rng)
+
+
+def engine_memory(players, teams, squad_size, seed):
+    tracemalloc.start()
+    engine = build_engine(players, teams, squad_size, seed)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return engine.nbytes, peak
+
+
+def drive(engine, seed):
+    """Run the auction to completion with random bidding, timing each hot-path call."""
+    rng = random.Random(seed)
+    team_ids = [t['id'] for t in engine.teams]
+    lot_times, bid_times, hammer_times = [], [], []
+    while not engine.is_complete():
+        start = time.perf_counter()
+        engine.next_lot()
+        lot_times.append(time.perf_counter() - start)
+
+        bidders = rng.sample(team_ids, min(4, len(team_ids)))
+        for _ in range(rng.randint(0, 8)):
+            team_id = rng.choice(bidders)
+            if engine.can_bid(team_id):
+                start = time.perf_counter()
+                engine.place_bid(team_id)
+                bid_times.append(time.perf_counter() - start)
+
+        if engine.current_team is not None:
+            start = time.perf_counter()
+            engine.hammer()
+            hammer_times.append(time.perf_counter() - start)
+        else:
+            engine.pass_lot()
+    return lot_times, bid_times, hammer_times
+
+
+def median_us(samples):
+    return statistics.median(samples) * 1e6 if samples else 0.0
+
+
+def timed_ms(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def render_ms(at):
+    """Median time of a plain rerun of the page `at` is on."""
+    times = []
+    for _ in range(RENDER_RERUNS):
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(f"App raised during render: {at.exception[0].message}")
+    return statistics.median(times) * 1000
+
+
+def page_renders(players, teams, squad_size, seed):
+    setup = AppTest.from_file(APP, default_timeout=300)
+    setup.run()
+    setup.number_input[0].set_value(teams).run()
+
+    auction = AppTest.from_file(APP, default_timeout=300)
+    room = AuctionRoom(build_engine(players, teams, squad_size, seed))
+    auction.session_state['room'] = room
+    auction.session_state['engine'] = room.engine
+    auction.session_state['app_stage'] = 'auction'
+    auction.run()
+
+    results = AppTest.from_file(APP, default_timeout=300)
+    engine = build_engine(players, teams, squad_size, seed)
+    drive(engine, seed)
+    results.session_state['engine'] = engine
+    results.session_state['export'] = build_export(engine)
+    results.session_state['app_stage'] = 'results'
+    results.run()
+
+    return {
+        'render_setup_ms': render_ms(setup),
+        'render_auction_ms': render_ms(auction),
+        'render_results_ms': render_ms(results),
+    }
+
+
+def run_config(players, teams, squad_size, repeat, seed, renders=True):
+    runs = []
+    for i in range(repeat):
+        engine = build_engine(players, teams, squad_size, seed + i)
+        lot_times, bid_times, hammer_times = drive(engine, seed + i)
+
+        def aggregate():
+            results_frame(engine)
+            engine.ledger.top_sales()
+
+        runs.append({
+            'lot_selection_us': median_us(lot_times),
+            'bid_us': median_us(bid_times),
+            'hammer_us': median_us(hammer_times),
+            'results_ms': timed_ms(aggregate),
+            'export_ms': timed_ms(lambda: build_export(engine)),
+        })
+        if renders:
+            runs[-1].update(page_renders(players, teams, squad_size, seed + i))
+
+    # Best of the repeats for timings; memory is deterministic and measured once
+    metrics = {name: min(run[name] for run in runs) for name in runs[0]}
+    metrics['engine_bytes'], metrics['build_peak_bytes'] = engine_memory(players, teams, squad_size, seed)
+    return metrics
+
+
+def compare(results, baseline, threshold):
+    """(key, metric, baseline value, new value, ratio) for every metric worse than `threshold`."""
+    regressions = []
+    for key, metrics in results.items():
+        old = baseline['results'].get(key)
+        if old is None:
+            continue
+        for name, value in metrics.items():
+            before = old.get(name)
+            if not before:
+                continue
+            ratio = value / before
+            if ratio > 1 + threshold:
+                regressions.append((key, name, before, value, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, nargs='+')
+    parser.add_argument('--teams', type=int, nargs='+')
+    parser.add_argument('--squad-size', type=int, nargs='+')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-render', action='store_true', help="Skip the AppTest page renders")
+    parser.add_argument('--save', help="Write the results to this JSON baseline file")
+    parser.add_argument('--compare', help="Baseline JSON file to check the results against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before a metric counts as a regression, e.g. 0.2 for 20%%")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    if baseline is not None and not (args.players or args.teams or args.squad_size):
+        # Run exactly the configurations the baseline has
+        configs = [(c['players'], c['teams'], c['squad_size']) for c in baseline['configs']]
+    else:
+        configs = list(itertools.product(args.players or DEFAULT_PLAYERS, args.teams or DEFAULT_TEAMS,
+                                         args.squad_size or DEFAULT_SQUAD_SIZES))
+
+    results = {}
+    for players, teams, squad_size in configs:
+        key = config_key(players, teams, squad_size)
+        metrics = run_config(players, teams, squad_size, args.repeat, args.seed, renders=not args.no_render)
+        results[key] = metrics
+        print(key)
+        for name, value in metrics.items():
+            print(f"  {name:<20} {value:>14,.2f}")
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'configs': [{'players': p, 'teams': t, 'squad_size': s} for p, t, s in configs],
+        'results': results,
+    }
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or '.', exist_ok=True)
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.save}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regressions beyond {args.threshold:.0%} against {args.compare}:")
+            for key, name, before, value, ratio in regressions:
+                print(f"  {key}  {name}: {before:,.2f} -> {value:,.2f} ({ratio - 1:+.0%})")
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Auction result exports, built once in memory when the auction completes.
+
+`build_export` produces every download the results page offers: one CSV per
+team (with the team summary row), the full results as CSV and Parquet, and
+a zip bundling all of them. The results page only hands these bytes to
+download buttons, so rerendering it does no I/O. Files are written to disk
+only when asked, by `save_export` on a background thread.
+"""
+import io
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+EXPORT_DIR = 'team_data'
+
+RESULT_COLUMNS = ['Team', 'Player', 'Role', 'Country', 'Base Price (crores)', 'Price (crores)', 'Batting Avg',
+                  'Bowling Avg', 'Matches']
+
+# One writer thread is plenty: saves are rare and small next to the auction itself
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='export-writer')
+
+
+class AuctionExport:
+    def __init__(self, results, team_files):
+        self.results = results  # Full results DataFrame, one row per sold player
+        self.team_files = team_files  # team id -> (file name, CSV bytes), for teams with players
+        self.results_csv = results.to_csv(index=False).encode('utf-8')
+
+        buffer = io.BytesIO()
+        results.to_parquet(buffer, index=False)
+        self.results_parquet = buffer.getvalue()
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as bundle:
+            for filename, data in team_files.values():
+                bundle.writestr(f"teams/{filename}", data)
+            bundle.writestr('cricket_auction_results.csv', self.results_csv)
+            bundle.writestr('cricket_auction_results.parquet', self.results_parquet)
+        self.bundle = buffer.getvalue()
+
+    @property
+    def nbytes(self):
+        return (int(self.results.memory_usage(deep=True).sum()) + len(self.results_csv) + len(self.results_parquet)
+                + len(self.bundle) + sum(len(data) for _, data in self.team_files.values()))
+
+
+def team_filename(team, taken=()):
+    # Replace invalid characters in team name for filename
+    stem = team['name'].replace(" ", "_").replace("/", "_").replace("\\", "_")
+    # Team names need not be unique: number repeats so no team's file replaces another's
+    filename, count = stem + ".csv", 1
+    while filename in taken:
+        count += 1
+        filename = f"{stem}_{count}.csv"
+    return filename
+
+
+def results_frame(engine):
+    """Every sold player with their team, in team order, gathered column-wise from the store."""
+    store = engine.players
+    ids = np.array([player_id for team in engine.teams for player_id in team['players']], dtype=np.int64)
+    teams = [team['name'] for team in engine.teams for _ in team['players']]
+    return pd.DataFrame({
+        'Team': teams,
+        'Player': store.column('name')[ids],
+        'Role': np.array(store.roles, dtype=object)[store.column('role')[ids]],
+        'Country': np.array(store.countries, dtype=object)[store.column('country')[ids]],
+        'Base Price (crores)': store.column('base_price')[ids],
+        'Price (crores)': store.column('sold_price')[ids],
+        'Batting Avg': store.column('batting_avg')[ids].astype(np.float64).round(2),
+        'Bowling Avg': store.column('bowling_avg')[ids].astype(np.float64).round(2),
+        'Matches': store.column('matches_played')[ids],
+    }, columns=RESULT_COLUMNS)
+
+
+def team_csv(team, rows, spent):
+    df = rows.drop(columns='Team').rename(columns={'Player': 'Name'})
+
+    # Add team summary at the bottom
+    summary_df = pd.DataFrame([{
+        'Name': f"TEAM SUMMARY: {team['name']}",
+        'Role': '',
+        'Country': '',
+        'Base Price (crores)': '',
+        'Price (crores)': spent,
+        'Batting Avg': '',
+        'Bowling Avg': '',
+        'Matches': ''
+    }])
+    return pd.concat([df, summary_df]).to_csv(index=False).encode('utf-8')
+
+
+def build_export(engine):
+    results = results_frame(engine)
+    team_files = {}
+    taken = set()
+    start = 0
+    for team in engine.teams:
+        count = len(team['players'])
+        if count:
+            rows = results.iloc[start:start + count]
+            filename = team_filename(team, taken)
+            taken.add(filename)
+            team_files[team['id']] = (filename, team_csv(team, rows, engine.ledger.spent_by_team[team['id']]))
+        start += count
+    return AuctionExport(results, team_files)
+
+
+def save_export(export, directory=EXPORT_DIR):
+    """Write the export to `directory` in the background.
+
+    Returns a Future resolving to the list of paths written.
+    """
+    return _writer.submit(_write_files, export, directory)
+
+
+def _write_files(export, directory):
+    os.makedirs(directory, exist_ok=True)
+    files = [(filename, data) for filename, data in export.team_files.values()]
+    files.append(('cricket_auction_results.csv', export.results_csv))
+    files.append(('cricket_auction_results.parquet', export.results_parquet))
+
+    paths = []
+    for filename, data in files:
+        path = os.path.join(directory, filename)
+        with open(path, 'wb') as f:
+            f.write(data)
+        paths.append(path)
+    return paths
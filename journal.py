@@ -0,0 +1,222 @@
+"""Append-only auction journal with snapshots and crash recovery.
+
+Each auction gets a directory holding:
+
+- ``auction.json``: the setup (auction id, teams with starting purses,
+  squad rules, increment ladder, lot sets)
+- ``players.npz``: the player pool
+- ``journal.jsonl``: one JSON line per engine event (lot opened, bid, proxy,
+  hammer, pass), each with a sequence number
+- ``snapshot.json``: the engine state as of some sequence number, rewritten
+  every few thousand events so recovery only replays the tail of the journal
+- ``completed``: an empty marker written when the auction finishes
+
+Events are written to the OS on every append, so a crash of the app process
+loses nothing; fsync is batched (every `sync_every` events or `sync_interval`
+seconds) so a power cut loses at most that window. When bidding goes quiet
+before a batch fills up, a timer syncs what is pending once the interval is
+up.
+"""
+import json
+import math
+import os
+import threading
+import time
+import zipfile
+
+from auction_engine import AuctionEngine, AuctionError
+from players import PlayerStore
+from squad_rules import SquadRules
+
+JOURNAL_DIR = 'auctions'
+SYNC_EVERY = 64
+SYNC_INTERVAL = 0.5  # seconds
+SNAPSHOT_EVERY = 5_000  # events
+
+
+class JournalError(Exception):
+    """Raised when a journal directory cannot be read back into an auction."""
+
+
+class AuctionJournal:
+    def __init__(self, directory, engine, seq=0, sync_every=SYNC_EVERY, sync_interval=SYNC_INTERVAL,
+                 snapshot_every=SNAPSHOT_EVERY):
+        self.directory = directory
+        self.engine = engine
+        self.seq = seq
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.snapshot_every = snapshot_every
+        self._file = open(os.path.join(directory, 'journal.jsonl'), 'ab')
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._since_snapshot = 0
+        self._lock = threading.Lock()  # The sync timer runs on its own thread
+        self._timer = None
+        engine.subscribe(self.record)
+
+    @classmethod
+    def create(cls, engine, root=JOURNAL_DIR, **options):
+        """Start a journal for a new auction under `root`/<auction id>."""
+        directory = os.path.join(root, engine.id)
+        os.makedirs(directory)
+        setup = {
+            'id': engine.id,
+            'max_squad_size': engine.max_squad_size,
+            'rules': engine.rules.to_dict(),
+            'ladder': engine.ladder,
+            'lot_sets': engine.lot_sets,
+            'teams': [{'id': t['id'], 'name': t['name'], 'purse': t['original_purse']} for t in engine.teams],
+        }
+        engine.players.save(os.path.join(directory, 'players.npz'))
+        _write_atomic(os.path.join(directory, 'auction.json'), setup)
+        return cls(directory, engine, **options)
+
+    def record(self, event):
+        with self._lock:
+            self.seq += 1
+            line = json.dumps({'seq': self.seq, **event}, separators=(',', ':'))
+            self._file.write(line.encode('utf-8') + b'\n')
+            self._file.flush()
+            self._pending += 1
+            self._since_snapshot += 1
+
+            if self._pending >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+                self._sync()
+            elif self._timer is None and math.isfinite(self.sync_interval):
+                self._timer = threading.Timer(self.sync_interval, self._sync_later)
+                self._timer.daemon = True
+                self._timer.start()
+        if self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def sync(self):
+        with self._lock:
+            self._sync()
+
+    def _sync(self):
+        if self._pending:
+            os.fsync(self._file.fileno())
+            self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _sync_later(self):
+        with self._lock:
+            self._timer = None
+            if not self._file.closed:
+                self._sync()
+
+    def snapshot(self):
+        """Save the engine state so recovery can skip the journal up to this point."""
+        self.sync()
+        _write_atomic(os.path.join(self.directory, 'snapshot.json'), {
+            'seq': self.seq,
+            'offset': self._file.tell(),
+            'state': self.engine.state(),
+        })
+        self._since_snapshot = 0
+
+    def mark_complete(self):
+        self.sync()
+        open(os.path.join(self.directory, 'completed'), 'w').close()
+
+    def close(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._sync()
+            self._file.close()
+
+
+def recover(directory, **options):
+    """Rebuild an auction from its journal directory.
+
+    Returns (engine, journal), with the journal reopened for appending.
+    """
+    try:
+        with open(os.path.join(directory, 'auction.json')) as f:
+            setup = json.load(f)
+        players = PlayerStore.load(os.path.join(directory, 'players.npz'))
+        # Journals from before squad rules only have the squad size
+        rules = SquadRules.from_dict(setup['rules']) if 'rules' in setup else SquadRules(setup['max_squad_size'])
+    except (OSError, ValueError, TypeError, KeyError, EOFError, zipfile.BadZipFile) as e:
+        raise JournalError(f"Cannot read auction setup in {directory}: {e}") from e
+
+    teams = [{
+        'id': t['id'],
+        'name': t['name'],
+        'purse': t['purse'],
+        'original_purse': t['purse'],
+        'players': [],
+        'can_bid': True
+    } for t in setup['teams']]
+    ladder = [tuple(band) for band in setup['ladder']]
+    engine = AuctionEngine(teams, players, ladder=ladder, auction_id=setup['id'], rules=rules,
+                           lot_sets=setup.get('lot_sets'))
+
+    seq, offset = 0, 0
+    snapshot_path = os.path.join(directory, 'snapshot.json')
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path) as f:
+            snapshot = json.load(f)
+        engine.restore(snapshot['state'])
+        seq, offset = snapshot['seq'], snapshot['offset']
+
+    journal_path = os.path.join(directory, 'journal.jsonl')
+    good_end = offset
+    if os.path.exists(journal_path):
+        with open(journal_path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    event = json.loads(line) if line.endswith(b'\n') else None
+                except ValueError:
+                    event = None
+                if event is None:
+                    break  # A write cut short by the crash; nothing after it can be trusted
+                if event['seq'] != seq + 1:
+                    raise JournalError(f"Journal jumps from event {seq} to {event['seq']}")
+                try:
+                    engine.apply(event)
+                except AuctionError as e:
+                    raise JournalError(f"Event {event['seq']} cannot be replayed: {e}") from e
+                seq = event['seq']
+                good_end += len(line)
+        # Drop the torn tail so new events are appended after the last complete one
+        with open(journal_path, 'ab') as f:
+            f.truncate(good_end)
+
+    return engine, AuctionJournal(directory, engine, seq=seq, **options)
+
+
+def incomplete_auctions(root=JOURNAL_DIR):
+    """Directories of journaled auctions that never finished, most recently active first."""
+    found = [d for d in _auction_dirs(root) if not os.path.exists(os.path.join(d, 'completed'))]
+    return sorted(found, key=_last_activity, reverse=True)
+
+
+def completed_auctions(root=JOURNAL_DIR):
+    """Directories of journaled auctions that ran to the end, in name order."""
+    return sorted(d for d in _auction_dirs(root) if os.path.exists(os.path.join(d, 'completed')))
+
+
+def _auction_dirs(root):
+    if not os.path.isdir(root):
+        return []
+    directories = (os.path.join(root, name) for name in os.listdir(root))
+    return [d for d in directories if os.path.exists(os.path.join(d, 'auction.json'))]
+
+
+def _last_activity(directory):
+    journal_path = os.path.join(directory, 'journal.jsonl')
+    return os.path.getmtime(journal_path if os.path.exists(journal_path) else os.path.join(directory, 'auction.json'))
+
+
+def _write_atomic(path, data):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
@@ -0,0 +1,76 @@
+"""Running aggregates over the auction, updated as each lot closes.
+
+`AuctionEngine` records every sale and pass here, so progress and results
+figures are read in O(1) instead of being recomputed from the player pool on
+every rerun.
+"""
+import heapq
+from collections import Counter, defaultdict
+
+TOP_N = 10
+
+
+class AuctionLedger:
+    def __init__(self, top_n=TOP_N):
+        self.top_n = top_n
+        self.version = 0  # Bumped on every change, so views can tell when to rebuild
+        self.sold_count = 0
+        self.passed_count = 0
+        self.total_spent = 0.0
+        self.spent_by_team = Counter()
+        self.players_by_team = Counter()
+        self.spent_by_role = Counter()
+        self.spent_by_country = Counter()
+        self.roles_by_team = defaultdict(Counter)
+        self.roster_versions = Counter()  # Per team, bumped whenever its squad changes
+        self.transactions = []  # (player id, team id, price) in the order players were sold
+        self.bid_count = 0
+        self.proxy_bid_count = 0  # Bids placed automatically on behalf of a team's max bid
+        # Player id -> [(team id, amount, proxy?), ...] for every closed lot. Snapshots do not
+        # keep outbid bids, so after a restore this only covers lots closed since.
+        self.bid_history = {}
+        self._lot_bids = []
+        self._top = []  # Min-heap of (price, -sale number, player id) holding the top_n sales
+
+    @property
+    def average_price(self):
+        return round(self.total_spent / self.sold_count, 2) if self.sold_count else 0
+
+    def record_bid(self, team_id, amount, proxy=False):
+        self.bid_count += 1
+        self.proxy_bid_count += proxy
+        self._lot_bids.append((team_id, amount, proxy))
+
+    def _close_lot(self, player):
+        self.bid_history[player.id] = self._lot_bids
+        self._lot_bids = []
+
+    def record_sale(self, player, team_id, price):
+        self._close_lot(player)
+        self.sold_count += 1
+        self.total_spent = round(self.total_spent + price, 2)
+        self.spent_by_team[team_id] = round(self.spent_by_team[team_id] + price, 2)
+        self.players_by_team[team_id] += 1
+        self.spent_by_role[player.role] = round(self.spent_by_role[player.role] + price, 2)
+        self.spent_by_country[player.country] = round(self.spent_by_country[player.country] + price, 2)
+        self.roles_by_team[team_id][player.role] += 1
+        self.roster_versions[team_id] += 1
+        self.transactions.append((player.id, team_id, price))
+
+        # Earlier sales win ties, so the first player sold at the top price stays the highest paid
+        entry = (price, -len(self.transactions), player.id)
+        if len(self._top) < self.top_n:
+            heapq.heappush(self._top, entry)
+        elif entry > self._top[0]:
+            heapq.heapreplace(self._top, entry)
+        self.version += 1
+
+    def record_pass(self, player):
+        self._close_lot(player)
+        self.passed_count += 1
+        self.version += 1
+
+    def top_sales(self, n=None):
+        """(player id, price) for the most expensive sales, highest first."""
+        top = sorted(self._top, reverse=True)[:n or self.top_n]
+        return [(player_id, price) for price, _, player_id in top]
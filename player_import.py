@@ -0,0 +1,204 @@
+"""Bulk player import from CSV or Parquet files.
+
+Files are read in chunks and each chunk is validated, coerced and appended
+straight into a `PlayerStore`, so a multi-million row file never exists in
+memory as more than one chunk of pandas data plus the store itself.
+
+Column names are matched case-insensitively, with spaces treated as
+underscores, so both ``base_price`` and ``Base Price`` work. ``name``,
+``role``, ``country`` and ``base_price`` are required; the stat columns are
+optional.
+"""
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from players import PLAYER_ROLES, STAT_COLUMNS, PlayerStore
+
+REQUIRED_COLUMNS = ['name', 'role', 'country', 'base_price']
+
+COLUMN_ALIASES = {
+    'player': 'name',
+    'player_name': 'name',
+    'matches': 'matches_played',
+    'base_price_(crores)': 'base_price',
+}
+
+# Accepted spellings of each role, after lowercasing and dropping spaces, hyphens and underscores
+ROLE_ALIASES = {
+    'batsman': 'Batsman',
+    'batter': 'Batsman',
+    'bowler': 'Bowler',
+    'allrounder': 'All-rounder',
+    'wicketkeeper': 'Wicket-keeper',
+    'keeper': 'Wicket-keeper',
+    'wk': 'Wicket-keeper',
+}
+
+MAX_REPORTED_ERRORS = 20
+
+
+class PlayerImportError(ValueError):
+    """Raised when a player file cannot be read or has no usable rows."""
+
+
+def import_players(source, file_format=None, chunk_size=100_000, memory_map=False, errors='skip', store=None):
+    """Read players from `source` into a `PlayerStore`.
+
+    `source` is a path or a binary file object (e.g. a Streamlit upload).
+    `file_format` is 'csv' or 'parquet' and is guessed from the file name
+    when omitted. Invalid rows are skipped and reported, or raise
+    `PlayerImportError` when `errors='raise'`.
+
+    Returns (store, report) where report counts the rows read, imported and
+    skipped and keeps the first few error messages.
+    """
+    if errors not in ('skip', 'raise'):
+        raise ValueError("errors must be 'skip' or 'raise'")
+    file_format = file_format or _guess_format(source)
+    store = store if store is not None else PlayerStore()
+    report = {'rows': 0, 'imported': 0, 'skipped': 0, 'errors': []}
+
+    if file_format == 'csv':
+        chunks = _csv_chunks(source, chunk_size, memory_map)
+    elif file_format == 'parquet':
+        chunks = _parquet_chunks(source, chunk_size, memory_map, store)
+    else:
+        raise PlayerImportError(f"Unsupported player file format: {file_format}")
+
+    try:
+        for chunk in chunks:
+            _append_chunk(store, chunk, report, errors)
+    except PlayerImportError:
+        raise
+    except (OSError, ValueError, pd.errors.ParserError) as e:
+        raise PlayerImportError(f"Could not read player file: {e}") from e
+
+    if not report['imported']:
+        raise PlayerImportError("No valid players found in the file")
+    return store, report
+
+
+def _guess_format(source):
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    ext = os.path.splitext(str(name))[1].lower()
+    if ext in ('.parquet', '.pq'):
+        return 'parquet'
+    if ext in ('.csv', '.txt', ''):
+        return 'csv'
+    raise PlayerImportError(f"Cannot tell the format of {name!r}; expected .csv or .parquet")
+
+
+def _normalise_column(name):
+    key = str(name).strip().lower().replace(' ', '_')
+    return COLUMN_ALIASES.get(key, key)
+
+
+def _csv_chunks(source, chunk_size, memory_map):
+    header = pd.read_csv(source, nrows=0)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    wanted = {col: _normalise_column(col) for col in header.columns
+              if _normalise_column(col) in REQUIRED_COLUMNS + STAT_COLUMNS}
+    _check_required(wanted.values())
+    # Text columns are read as str so values like 'NA' for a country are kept as written
+    dtypes = {col: str for col, key in wanted.items() if key in ('name', 'role', 'country')}
+    reader = pd.read_csv(source, usecols=list(wanted), dtype=dtypes, chunksize=chunk_size,
+                         memory_map=memory_map and isinstance(source, (str, os.PathLike)),
+                         keep_default_na=False, na_values=[''])
+    with reader:
+        for chunk in reader:
+            yield chunk.rename(columns=wanted)
+
+
+def _parquet_chunks(source, chunk_size, memory_map, store):
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(source, memory_map=memory_map)
+    wanted = {col: _normalise_column(col) for col in parquet_file.schema_arrow.names
+              if _normalise_column(col) in REQUIRED_COLUMNS + STAT_COLUMNS}
+    _check_required(wanted.values())
+    store.reserve(len(store) + parquet_file.metadata.num_rows)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=list(wanted)):
+        yield batch.to_pandas().rename(columns=wanted)
+
+
+def _check_required(columns):
+    missing = [col for col in REQUIRED_COLUMNS if col not in set(columns)]
+    if missing:
+        raise PlayerImportError(f"Player file is missing required columns: {', '.join(missing)}")
+
+
+def _append_chunk(store, chunk, report, errors):
+    first_row = report['rows']
+    report['rows'] += len(chunk)
+
+    names = chunk['name'].astype('string').str.strip()
+    # Roles and countries repeat heavily, so normalise each distinct value once
+    roles = _category_codes(chunk['role'], lambda role: _role_code(store, role))
+    countries = _category_codes(chunk['country'], lambda country: _country_code(store, country))
+    prices = pd.to_numeric(chunk['base_price'], errors='coerce')
+    batting = _numeric_column(chunk, 'batting_avg')
+    bowling = _numeric_column(chunk, 'bowling_avg')
+    matches = _numeric_column(chunk, 'matches_played')
+
+    problems = [
+        (names.isna() | (names == ''), "missing name"),
+        (pd.Series(roles < 0), "unknown role"),
+        (pd.Series(countries < 0), "missing country"),
+        (prices.isna() | ~(prices > 0), "base price must be a positive number"),
+        (batting < 0, "negative batting average"),
+        (bowling < 0, "negative bowling average"),
+        ((matches < 0) | (matches.notna() & (matches % 1 != 0)), "matches played must be a whole number"),
+    ]
+    masks = [(mask.fillna(False).to_numpy(dtype=bool, na_value=False), message) for mask, message in problems]
+    invalid = np.logical_or.reduce([mask for mask, _ in masks])
+    if invalid.any():
+        reported = MAX_REPORTED_ERRORS - len(report['errors']) if errors == 'skip' else 1
+        for row in np.flatnonzero(invalid)[:reported]:
+            message = next(message for mask, message in masks if mask[row])
+            if errors == 'raise':
+                raise PlayerImportError(f"Row {first_row + row + 1}: {message}")
+            report['errors'].append(f"Row {first_row + row + 1}: {message}")
+
+    valid = ~invalid
+    count = int(valid.sum())
+    report['skipped'] += len(chunk) - count
+    if not count:
+        return
+
+    store.extend(
+        names[valid].to_numpy(dtype=object),
+        roles[valid],
+        countries[valid],
+        prices[valid].to_numpy(dtype=np.float64),
+        batting[valid].to_numpy(dtype=np.float32, na_value=np.nan),
+        bowling[valid].to_numpy(dtype=np.float32, na_value=np.nan),
+        matches[valid].fillna(0).to_numpy(dtype=np.int32),
+    )
+    report['imported'] += count
+
+
+def _category_codes(column, code_for):
+    # Per-row store codes for a categorical column, -1 where the value is missing or invalid
+    codes, uniques = pd.factorize(column)
+    lookup = np.array([code_for(value) for value in uniques] + [-1], dtype=np.int16)
+    return lookup[codes]  # factorize marks missing values as -1, which picks the trailing -1
+
+
+def _role_code(store, role):
+    role = ROLE_ALIASES.get(re.sub(r'[\s_-]', '', str(role).lower()))
+    return store.role_code(role) if role in PLAYER_ROLES else -1
+
+
+def _country_code(store, country):
+    country = str(country).strip()
+    return store.country_code(country) if country else -1
+
+
+def _numeric_column(chunk, column):
+    if column not in chunk:
+        return pd.Series(np.nan, index=chunk.index)
+    return pd.to_numeric(chunk[column], errors='coerce')
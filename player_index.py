@@ -0,0 +1,142 @@
+"""Secondary indexes over a `PlayerStore`, for filtered queries on large pools.
+
+Role and country are indexed by grouping the player ids per category code;
+base price and the stats by the ids sorted on that column, so a range is two
+binary searches. A query starts from whichever filter matches the fewest
+players and checks the others against the columns for those candidates
+only, so it touches the rows it might return rather than the whole pool.
+
+The indexed columns never change during an auction (outcomes live in other
+columns), so an index is built once per pool. Stats may be missing (NaN) in
+imported pools; those players sort after every value and match no range.
+"""
+import numpy as np
+
+CATEGORY_COLUMNS = ['role', 'country']
+RANGE_COLUMNS = ['base_price', 'batting_avg', 'bowling_avg', 'matches_played']
+
+
+class PlayerIndex:
+    def __init__(self, store):
+        self.store = store
+        self.size = len(store)
+        self._groups = {}  # column -> (ids ordered by code, offset where each code's ids start)
+        for column in CATEGORY_COLUMNS:
+            codes = store.column(column)
+            counts = np.bincount(codes, minlength=np.iinfo(codes.dtype).max + 1)
+            starts = np.concatenate([[0], np.cumsum(counts)])
+            self._groups[column] = (np.argsort(codes, kind='stable').astype(np.int32), starts)
+        self._sorted = {}  # column -> (ids ordered by value, the values in that order, how many are not NaN)
+        for column in RANGE_COLUMNS:
+            values = store.column(column)
+            order = np.argsort(values, kind='stable').astype(np.int32)
+            ordered = values[order]
+            # NaNs sort last, so the values before the first one are the players with this stat
+            finite = int(np.searchsorted(ordered, np.nan)) if ordered.dtype.kind == 'f' else len(ordered)
+            self._sorted[column] = (order, ordered, finite)
+
+    @property
+    def nbytes(self):
+        groups = sum(order.nbytes + starts.nbytes for order, starts in self._groups.values())
+        return groups + sum(order.nbytes + values.nbytes for order, values, _ in self._sorted.values())
+
+    def bounds(self, column):
+        """(lowest, highest) value of a range column, or None if no player has one."""
+        _, values, finite = self._sorted[column]
+        if not finite:
+            return None
+        return values[0].item(), values[finite - 1].item()
+
+    def query(self, roles=None, countries=None, name=None, where=None, **ranges):
+        """Ids of the players matching every filter, in ascending order.
+
+        `roles` and `countries` are lists of names. Each range column takes a
+        (low, high) pair, inclusive, where either end may be None. `name`
+        matches a case-insensitive substring, and `where` is a boolean array
+        over the whole pool, e.g. the players still to be auctioned.
+        """
+        filters = []  # (matching players, ids(), keep(candidate ids) -> bool mask)
+        for column, names in (('role', roles), ('country', countries)):
+            if names is not None:
+                filters.append(self._category(column, names))
+        for column, (low, high) in ranges.items():
+            if column not in self._sorted:
+                raise ValueError(f"No range index on {column!r}")
+            if low is not None or high is not None:
+                filters.append(self._range(column, low, high))
+
+        if filters:
+            filters.sort(key=lambda f: f[0])
+            ids = np.sort(filters[0][1]())
+            for _, _, keep in filters[1:]:
+                if not len(ids):
+                    break
+                ids = ids[keep(ids)]
+        else:
+            ids = np.arange(self.size, dtype=np.int32)
+        if where is not None:
+            ids = ids[where[ids]]
+        if name:
+            needle = name.lower()
+            names = self.store.column('name')[ids]
+            ids = ids[np.fromiter((needle in n.lower() for n in names), dtype=bool, count=len(names))]
+        return ids
+
+    def _category(self, column, names):
+        vocabulary = self.store.roles if column == 'role' else self.store.countries
+        codes = [vocabulary.index(n) for n in names if n in vocabulary]
+        order, starts = self._groups[column]
+        count = sum(starts[c + 1] - starts[c] for c in codes)
+        values = self.store.column(column)
+        return (count,
+                lambda: np.concatenate([order[starts[c]:starts[c + 1]] for c in codes] or [order[:0]]),
+                lambda ids: np.isin(values[ids], codes))
+
+    def _range(self, column, low, high):
+        order, sorted_values, finite = self._sorted[column]
+        # Compare in the column's own precision, so a float32 stat matches the value it was written from
+        dtype = sorted_values.dtype if sorted_values.dtype.kind == 'f' else np.float64
+        sorted_values = sorted_values[:finite]
+        start = 0 if low is None else np.searchsorted(sorted_values, np.asarray(low, dtype=dtype), 'left')
+        stop = finite if high is None else np.searchsorted(sorted_values, np.asarray(high, dtype=dtype), 'right')
+        values = self.store.column(column)
+
+        def keep(ids):
+            mask = np.ones(len(ids), dtype=bool)
+            if low is not None:
+                mask &= values[ids] >= np.asarray(low, dtype=dtype)
+            if high is not None:
+                mask &= values[ids] <= np.asarray(high, dtype=dtype)
+            return mask
+
+        return max(0, stop - start), lambda: order[start:stop], keep
+
+    def sort(self, ids, column, descending=False):
+        """`ids` ordered by a range column, ties in pool order and missing values last."""
+        if len(ids) * 8 < self.size:
+            key = self.store.column(column)[ids]
+            return ids[np.argsort(-key if descending else key, kind='stable')]
+        # Large selections: walk the prebuilt order instead of sorting
+        selected = np.zeros(self.size, dtype=bool)
+        selected[ids] = True
+        order, sorted_values, finite = self._sorted[column]
+        keep = selected[order]
+        ids = order[keep]
+        if descending:
+            count = int(keep[:finite].sum())
+            flipped = _flip_ties(ids[:count][::-1], sorted_values[:finite][keep[:finite]][::-1])
+            ids = np.concatenate([flipped, ids[count:]])
+        return ids
+
+
+def _flip_ties(ids, values):
+    # Walking the order backwards puts equal values in reverse pool order; flip each run back
+    count = len(ids)
+    if count < 2:
+        return ids
+    starts = np.flatnonzero(np.concatenate([[True], values[1:] != values[:-1]]))
+    ends = np.append(starts[1:], count)
+    run = np.repeat(np.arange(len(starts)), ends - starts)
+    flipped = np.empty_like(ids)
+    flipped[starts[run] + ends[run] - 1 - np.arange(count)] = ids
+    return flipped
@@ -0,0 +1,151 @@
+"""Players still waiting to go under the hammer.
+
+Lots are drawn at random from the top few players by base price, so the pool
+keeps one queue of player ids per distinct base price, ordered highest
+first. Within a price the original pool order is kept, which gives exactly
+the ordering of a stable ``sorted(..., key=base_price, reverse=True)``
+without sorting on every lot.
+
+`LotSets` chains several pools, for auctions run in sets (marquee players
+first, then by role, and so on).
+"""
+from bisect import bisect_left, insort
+from collections import deque
+
+
+class RemainingPool:
+    def __init__(self, players=()):
+        """`players` is an iterable of (player id, base price) pairs in pool order."""
+        self._prices = {}  # id -> base price, for O(1) lookup and membership
+        self._buckets = {}  # base price -> deque of ids in pool order
+        self._neg_prices = []  # distinct base prices, negated so ascending order is highest first
+        self._unlinked = {}  # id -> base price, for ids removed but still sitting in a price queue
+        for player_id, base_price in players:
+            self.add(player_id, base_price)
+
+    def __len__(self):
+        return len(self._prices)
+
+    def __contains__(self, player_id):
+        return player_id in self._prices
+
+    def __iter__(self):
+        return iter(self._prices)
+
+    def price(self, player_id):
+        return self._prices[player_id]
+
+    def add(self, player_id, base_price):
+        if player_id in self._prices:
+            raise ValueError(f"Player {player_id} is already in the pool")
+        if player_id in self._unlinked:
+            # Left behind by an earlier remove(); drop it so the id is not seen twice
+            self._buckets[self._unlinked.pop(player_id)].remove(player_id)
+        bucket = self._buckets.get(base_price)
+        if bucket is None:
+            bucket = self._buckets[base_price] = deque()
+            insort(self._neg_prices, -base_price)
+        bucket.append(player_id)
+        self._prices[player_id] = base_price
+
+    def remove(self, player_id):
+        """Take a player out of the pool.
+
+        The id is only unlinked from its price queue lazily, the next time a
+        draw walks past it, so removal is O(1).
+        """
+        self._unlinked[player_id] = self._prices.pop(player_id)
+
+    def top(self, k):
+        """Ids of the first `k` players in lot order, highest base price first."""
+        return [player_id for _, _, player_id in self._walk(k)]
+
+    def draw(self, rng, k):
+        """Remove and return the id of a random player from the top `k`, or None if the pool is empty."""
+        if not self._prices:
+            return None
+        index = rng.randint(0, min(k, len(self._prices)) - 1)
+        for position, (bucket, offset, player_id) in enumerate(self._walk(index + 1)):
+            if position == index:
+                del bucket[offset]
+                del self._prices[player_id]
+                return player_id
+
+    def _walk(self, k):
+        # Yield (bucket, offset, id) for the first k live players, pruning stale ids on the way
+        found = 0
+        i = 0
+        while found < k and i < len(self._neg_prices):
+            price = -self._neg_prices[i]
+            bucket = self._buckets[price]
+            offset = 0
+            while found < k and offset < len(bucket):
+                player_id = bucket[offset]
+                if player_id not in self._prices:
+                    del bucket[offset]
+                    self._unlinked.pop(player_id, None)
+                    continue
+                yield bucket, offset, player_id
+                found += 1
+                offset += 1
+            if not bucket:
+                del self._buckets[price]
+                del self._neg_prices[bisect_left(self._neg_prices, -price)]
+            else:
+                i += 1
+
+
+class LotSets:
+    """The remaining players split into named sets that are auctioned one after another.
+
+    Each set is a `RemainingPool` of its own, so lots within a set are drawn
+    exactly as from a single pool; the next set opens once the one before it
+    is empty. Supports the same operations the engine uses on a `RemainingPool`.
+    """
+
+    def __init__(self, sets):
+        """`sets` is a list of (name, iterable of (player id, base price)) pairs, in auction order."""
+        self.sets = [(name, RemainingPool(players)) for name, players in sets]
+        self.current_set = None  # Name of the set the latest lot came from
+
+    def __len__(self):
+        return sum(len(pool) for _, pool in self.sets)
+
+    def __contains__(self, player_id):
+        return any(player_id in pool for _, pool in self.sets)
+
+    def __iter__(self):
+        return (player_id for _, pool in self.sets for player_id in pool)
+
+    def _find(self, player_id):
+        for name, pool in self.sets:
+            if player_id in pool:
+                return name, pool
+        raise KeyError(player_id)
+
+    def price(self, player_id):
+        return self._find(player_id)[1].price(player_id)
+
+    def remove(self, player_id):
+        self.current_set, pool = self._find(player_id)
+        pool.remove(player_id)
+
+    def top(self, k):
+        ids = []
+        for _, pool in self.sets:
+            if len(ids) >= k:
+                break
+            ids.extend(pool.top(k - len(ids)))
+        return ids
+
+    def draw(self, rng, k):
+        """Draw from the first set that still has players, or return None once every set is empty."""
+        for name, pool in self.sets:
+            if pool:
+                self.current_set = name
+                return pool.draw(rng, k)
+        return None
+
+    def remaining(self):
+        """(set name, players left) for every set, in auction order."""
+        return [(name, len(pool)) for name, pool in self.sets]
@@ -0,0 +1,338 @@
+"""Player data.
+
+Players live in a columnar `PlayerStore`: one NumPy array per attribute,
+integer ids that double as row numbers, and category codes for role and
+country. The rest of the app works with `PlayerRow` views, which read like
+the old player dicts (``player['name']``, ``player['stats']['batting_avg']``)
+without copying anything out of the store.
+"""
+import hashlib
+import json
+import os
+import random
+import uuid
+import zipfile
+
+import numpy as np
+
+PLAYER_ROLES = ['Batsman', 'Bowler', 'All-rounder', 'Wicket-keeper']
+PLAYER_COUNTRIES = ['India', 'Australia', 'England', 'New Zealand', 'South Africa', 'West Indies', 'Pakistan', 'Sri Lanka']
+BASE_PRICES = [0.5, 0.75, 1.0, 1.5, 2.0]  # Base prices in crores
+
+STATUSES = ['unsold', 'sold']
+UNSOLD, SOLD = 0, 1
+
+STAT_COLUMNS = ['batting_avg', 'bowling_avg', 'matches_played']
+PLAYER_COLUMNS = ['name', 'role', 'country', 'base_price'] + STAT_COLUMNS  # Everything but auction outcomes
+
+# Column name -> dtype. Names are Python strings; everything else is fixed width.
+COLUMNS = {
+    'name': object,
+    'role': np.uint8,
+    'country': np.uint8,
+    'base_price': np.float64,
+    'batting_avg': np.float32,
+    'bowling_avg': np.float32,
+    'matches_played': np.int32,
+    'status': np.uint8,
+    'sold_to': np.int32,  # index into PlayerStore.team_names, -1 while unsold
+    'sold_price': np.float64,
+}
+
+
+class PlayerStore:
+    def __init__(self, capacity=0, roles=PLAYER_ROLES, countries=PLAYER_COUNTRIES):
+        self.roles = list(roles)
+        self.countries = list(countries)
+        self.team_names = []
+        self._role_codes = {role: i for i, role in enumerate(self.roles)}
+        self._country_codes = {country: i for i, country in enumerate(self.countries)}
+        self._team_codes = {}
+        self._size = 0
+        self._name_bytes = 0  # Names never change once stored, so their size is added up as they arrive
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return (PlayerRow(self, i) for i in range(self._size))
+
+    def __getitem__(self, player_id):
+        if not 0 <= player_id < self._size:
+            raise KeyError(player_id)
+        return PlayerRow(self, player_id)
+
+    def column(self, name):
+        """Read-only view of one column, trimmed to the stored players."""
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the store, including the name strings."""
+        total = sum(col[:self._size].nbytes for col in self._columns.values())
+        return total + self._name_bytes
+
+    def copy(self):
+        """An independent store with the same players, e.g. to run another auction on the same pool."""
+        other = PlayerStore(roles=self.roles, countries=self.countries)
+        other.team_names = list(self.team_names)
+        other._team_codes = dict(self._team_codes)
+        other._size = self._size
+        other._name_bytes = self._name_bytes
+        other._columns = {name: col[:self._size].copy() for name, col in self._columns.items()}
+        return other
+
+    def save(self, path):
+        """Write the players (not their auction outcomes) to an .npz file."""
+        columns = {name: self.column(name) for name in PLAYER_COLUMNS}
+        columns['name'] = columns['name'].astype(str)
+        np.savez(path, roles=np.array(self.roles), countries=np.array(self.countries), **columns)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            store = cls(capacity=len(data['name']), roles=data['roles'].tolist(), countries=data['countries'].tolist())
+            store.extend(*(data[name] if name != 'name' else data[name].astype(object) for name in PLAYER_COLUMNS))
+        return store
+
+    def role_code(self, role):
+        return self._role_codes[role]
+
+    def country_code(self, country):
+        # Countries outside the default list get a new code the first time they are seen
+        code = self._country_codes.get(country)
+        if code is None:
+            if len(self.countries) > np.iinfo(COLUMNS['country']).max:
+                raise ValueError(f"Too many distinct countries to store {country!r}")
+            code = self._country_codes[country] = len(self.countries)
+            self.countries.append(country)
+        return code
+
+    def extend(self, name, role, country, base_price, batting_avg, bowling_avg, matches_played):
+        """Append a batch of players given as equal-length columns and return their ids.
+
+        `role` and `country` are category codes (see `role_code` and
+        `country_code`).
+        """
+        count = len(name)
+        self.reserve(self._size + count)
+        rows = slice(self._size, self._size + count)
+        cols = self._columns
+        cols['name'][rows] = name
+        self._name_bytes += sum(len(n) + 49 for n in cols['name'][rows])
+        cols['role'][rows] = role
+        cols['country'][rows] = country
+        cols['base_price'][rows] = base_price
+        cols['batting_avg'][rows] = batting_avg
+        cols['bowling_avg'][rows] = bowling_avg
+        cols['matches_played'][rows] = matches_played
+        cols['status'][rows] = UNSOLD
+        cols['sold_to'][rows] = -1
+        cols['sold_price'][rows] = 0.0
+        self._size += count
+        return range(rows.start, rows.stop)
+
+    def mark_sold(self, player_id, team_name, price):
+        code = self._team_codes.get(team_name)
+        if code is None:
+            code = self._team_codes[team_name] = len(self.team_names)
+            self.team_names.append(team_name)
+        self._columns['status'][player_id] = SOLD
+        self._columns['sold_to'][player_id] = code
+        self._columns['sold_price'][player_id] = price
+
+    def mark_unsold(self, player_id):
+        self._columns['status'][player_id] = UNSOLD
+        self._columns['sold_to'][player_id] = -1
+        self._columns['sold_price'][player_id] = 0.0
+
+    def ids_with_status(self, status):
+        return np.flatnonzero(self._columns['status'][:self._size] == status)
+
+    def rows(self, player_ids):
+        return [PlayerRow(self, int(i)) for i in player_ids]
+
+    def reserve(self, capacity):
+        """Make room for `capacity` players without further reallocation."""
+        current = len(self._columns['name'])
+        if capacity <= current:
+            return
+        capacity = max(capacity, current * 2)
+        for name, col in self._columns.items():
+            grown = np.empty(capacity, dtype=col.dtype)
+            grown[:self._size] = col[:self._size]
+            self._columns[name] = grown
+
+
+class PlayerRow:
+    """A single player in a `PlayerStore`, readable like the old player dict."""
+
+    __slots__ = ('store', 'id')
+
+    def __init__(self, store, player_id):
+        self.store = store
+        self.id = player_id
+
+    def __repr__(self):
+        return f"PlayerRow({self.id}, {self.name!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, PlayerRow) and other.store is self.store and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def _value(self, column):
+        return self.store._columns[column][self.id]
+
+    @property
+    def name(self):
+        return self._value('name')
+
+    @property
+    def role(self):
+        return self.store.roles[self._value('role')]
+
+    @property
+    def country(self):
+        return self.store.countries[self._value('country')]
+
+    @property
+    def base_price(self):
+        return float(self._value('base_price'))
+
+    @property
+    def stats(self):
+        return {
+            'batting_avg': round(float(self._value('batting_avg')), 2),
+            'bowling_avg': round(float(self._value('bowling_avg')), 2),
+            'matches_played': int(self._value('matches_played')),
+        }
+
+    @property
+    def status(self):
+        return STATUSES[self._value('status')]
+
+    @property
+    def sold_to(self):
+        code = self._value('sold_to')
+        return self.store.team_names[code] if code >= 0 else None
+
+    @property
+    def sold_price(self):
+        return float(self._value('sold_price'))
+
+    # Mapping-style access, so code written against player dicts keeps working
+    def __getitem__(self, key):
+        if key not in _ROW_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in _ROW_KEYS else default
+
+
+_ROW_KEYS = {'id', 'name', 'role', 'country', 'base_price', 'stats', 'status', 'sold_to', 'sold_price'}
+
+
+# Sample player data (you could load this from a CSV or database)
+
+# How generate_players draws each column. Categorical columns map each value
+# to a relative weight; numeric ones are (kind, *params) with kind one of
+# 'uniform' (low, high), 'normal' (mean, sd, low, high; clipped) or
+# 'integers' (low, high; inclusive).
+SAMPLE_DISTRIBUTIONS = {
+    'role': {role: 1 for role in PLAYER_ROLES},
+    'country': {country: 1 for country in PLAYER_COUNTRIES},
+    'base_price': {price: 1 for price in BASE_PRICES},
+    'batting_avg': ('uniform', 20, 60),
+    'bowling_avg': ('uniform', 18, 40),
+    'matches_played': ('integers', 10, 200),
+}
+
+POOL_CACHE_DIR = 'player_pools'
+GENERATOR_VERSION = 1  # Bump whenever generate_players would produce different pools, to retire old snapshots
+
+
+def generate_players(count=100, seed=0, distributions=None):
+    """Generate `count` sample players, column by column, from an explicit seed.
+
+    The same (count, seed, distributions) always gives the same pool.
+    `distributions` overrides entries of SAMPLE_DISTRIBUTIONS.
+    """
+    dist = {**SAMPLE_DISTRIBUTIONS, **(distributions or {})}
+    rng = np.random.default_rng(seed)
+    store = PlayerStore(capacity=count)
+
+    roles = _sample_categories(rng, dist['role'], count, store.role_code)
+    countries = _sample_categories(rng, dist['country'], count, store.country_code)
+    prices = _sample_categories(rng, dist['base_price'], count, float)
+    batting = _sample_stat(rng, dist['batting_avg'], count).round(1)
+    bowling = _sample_stat(rng, dist['bowling_avg'], count).round(1)
+    matches = _sample_stat(rng, dist['matches_played'], count)
+    # Names are the only per-player Python objects; formatting them dominates the cost
+    names = list(map('Player {}'.format, range(1, count + 1)))
+
+    store.extend(names, roles, countries, prices, batting, bowling, matches)
+    return store
+
+
+def _sample_categories(rng, weights, count, encode):
+    values = list(weights)
+    p = np.array([weights[value] for value in values], dtype=np.float64)
+    if not len(values) or (p < 0).any() or p.sum() <= 0:
+        raise ValueError(f"Invalid category weights: {weights!r}")
+    lookup = np.array([encode(value) for value in values])
+    return lookup[rng.choice(len(values), size=count, p=p / p.sum())]
+
+
+def _sample_stat(rng, spec, count):
+    kind, *params = spec
+    if kind == 'uniform':
+        low, high = params
+        return rng.uniform(low, high, count)
+    if kind == 'normal':
+        mean, sd, low, high = params
+        return np.clip(rng.normal(mean, sd, count), low, high)
+    if kind == 'integers':
+        low, high = params
+        return rng.integers(low, high + 1, count)
+    raise ValueError(f"Unknown distribution: {kind!r}")
+
+
+def pool_cache_key(count, seed, distributions=None):
+    params = {
+        'version': GENERATOR_VERSION,
+        'count': count,
+        'seed': seed,
+        'distributions': {**SAMPLE_DISTRIBUTIONS, **(distributions or {})},
+    }
+    return hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+def cached_players(count=100, seed=0, distributions=None, directory=POOL_CACHE_DIR):
+    """`generate_players`, loaded from an on-disk snapshot when this pool was generated before."""
+    path = os.path.join(directory, f"pool-{pool_cache_key(count, seed, distributions)}.npz")
+    try:
+        return PlayerStore.load(path)
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        pass  # Not cached yet (or an unreadable snapshot, which gets replaced)
+
+    store = generate_players(count, seed, distributions)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # Write under a unique name and rename, so a concurrent reader never sees half a file
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp.npz"
+        store.save(tmp)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # Without a writable cache directory the pool is simply generated each time
+    return store
+
+
+def generate_sample_players(count=100, rng=random):
+    """Sample players seeded from `rng`, so a seeded `random.Random` gives a reproducible pool."""
+    return generate_players(count, seed=rng.getrandbits(64))
@@ -0,0 +1,179 @@
+"""Per-rerun timing for the Streamlit app.
+
+Each session keeps a `RerunProfiler` that times named sections of every
+rerun, counts how many reruns each user action costs, and samples the size
+of the session state. Sections are sequential: `begin(name)` closes the
+section before it, so instrumenting a screen is one line per block rather
+than re-indenting it. Finished reruns are appended as JSON lines to
+`METRICS_FILE` for offline analysis, and the recent history feeds the
+debug panel in the sidebar.
+
+The hot path is one `perf_counter` call per section plus one line written
+per rerun; the session state is only sized every `SIZE_EVERY` reruns, so
+the profiler is cheap enough to leave on.
+"""
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+
+METRICS_FILE = os.path.join('metrics', 'reruns.jsonl')
+SIZE_EVERY = 10  # reruns
+HISTORY = 50  # reruns kept in memory for the debug panel
+
+
+class MetricsSink:
+    """Appends one JSON line per finished rerun, shared by every session of the process."""
+
+    def __init__(self, path=METRICS_FILE):
+        self.path = path
+        self.error = None  # Set, and writing stops, if the file cannot be written
+        self._file = None
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        if self.path is None or self.error is not None:
+            return
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        with self._lock:
+            try:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                    self._file = open(self.path, 'a', encoding='utf-8')
+                self._file.write(line)
+                self._file.flush()
+            except OSError as e:
+                self.error = e
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+metrics_sink = MetricsSink()
+
+
+class RerunProfiler:
+    def __init__(self, sink=metrics_sink, history=HISTORY, size_every=SIZE_EVERY):
+        self.session_id = uuid.uuid4().hex[:8]
+        self.sink = sink
+        self.size_every = size_every
+        self.reruns = 0
+        self.actions = Counter()  # Times each action was taken
+        self.reruns_by_action = Counter()  # Reruns spent on each action, including follow-up reruns
+        self.history = deque(maxlen=history)
+        self.state_bytes = 0
+        self.peak_state_bytes = 0
+        self._current = None
+        self._pending_action = None  # Set by widget callbacks, which run before the rerun starts
+        self._chained = False
+        self._last_action = None
+
+    def start(self, stage):
+        if self._pending_action is not None:
+            action = self._pending_action
+        elif self._chained:
+            action = self._last_action  # A rerun the app asked for to finish the previous action
+        else:
+            action = None
+        self._pending_action = None
+        self._chained = False
+        now = time.perf_counter()
+        self._current = {'stage': stage, 'action': action, 'sections': {}, 'idle': 0.0, 'start': now,
+                         'section': 'start', 'section_idle': False, 'section_start': now}
+
+    def begin(self, name, idle=False):
+        """End the running section and start timing `name`.
+
+        Idle sections (waiting on other sessions) count towards the rerun's
+        total but not its busy time.
+        """
+        current = self._current
+        if current is None:
+            return
+        now = time.perf_counter()
+        self._close_section(current, now)
+        current['section'], current['section_idle'], current['section_start'] = name, idle, now
+
+    def _close_section(self, current, now):
+        elapsed = now - current['section_start']
+        sections = current['sections']
+        sections[current['section']] = sections.get(current['section'], 0.0) + elapsed
+        if current['section_idle']:
+            current['idle'] += elapsed
+
+    def mark_action(self, name):
+        """Attribute the current rerun, or the next one when called from a widget callback, to `name`."""
+        self.actions[name] += 1
+        if self._current is None:
+            self._pending_action = name
+        else:
+            self._current['action'] = name
+
+    def chain(self):
+        """Call before asking Streamlit for a rerun, so that rerun is charged to the same action."""
+        self._chained = True
+
+    def finish(self, state=None):
+        current, self._current = self._current, None
+        if current is None:
+            return None
+        now = time.perf_counter()
+        self._close_section(current, now)
+        total = now - current['start']
+        self.reruns += 1
+        action = current['action']
+        self._last_action = action
+        self.reruns_by_action[action or 'widget'] += 1
+
+        record = {
+            'ts': time.time(),
+            'session': self.session_id,
+            'rerun': self.reruns,
+            'stage': current['stage'],
+            'action': action,
+            'total_ms': round(total * 1000, 3),
+            'busy_ms': round((total - current['idle']) * 1000, 3),
+            'sections': {name: round(elapsed * 1000, 3) for name, elapsed in current['sections'].items()},
+        }
+        if state is not None and (self.reruns == 1 or self.reruns % self.size_every == 0):
+            self.state_bytes = session_state_size(state)
+            self.peak_state_bytes = max(self.peak_state_bytes, self.state_bytes)
+            record['state_bytes'] = self.state_bytes
+
+        self.history.append(record)
+        if self.sink is not None:
+            self.sink.write(record)
+        return record
+
+    @property
+    def last(self):
+        return self.history[-1] if self.history else None
+
+
+def approx_size(value):
+    """Rough memory held by a session-state value.
+
+    Objects that know their footprint expose `nbytes`; containers are
+    counted one level deep, which is enough for the flat values the app keeps.
+    """
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, deque)):
+        size += sum(sys.getsizeof(v) for v in value)
+    return size
+
+
+def session_state_size(state):
+    return sum(approx_size(state[key]) for key in list(state.keys()))
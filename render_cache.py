@@ -0,0 +1,60 @@
+"""Process-wide cache for the DataFrames the UI renders.
+
+Tables are keyed on the auction id plus a version counter that changes
+whenever their contents can (a team's roster version, the ledger version),
+so an unchanged squad is a dictionary lookup instead of a fresh DataFrame on
+every rerun. The cache is shared by all sessions of the server process and
+evicts least recently used tables once it is full.
+"""
+import threading
+from collections import OrderedDict
+
+MAX_ENTRIES = 512
+
+
+class RenderCache:
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()  # Streamlit runs each session on its own thread
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_build(self, key, build):
+        """Return the cached value for `key`, calling `build()` to create it on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Build outside the lock; two sessions racing on the same key just build it twice
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+render_cache = RenderCache()
@@ -0,0 +1,156 @@
+"""Shared auction rooms, so every franchise can bid from its own session.
+
+A room wraps one `AuctionEngine` that every session of the server process
+reaches through the module-level `rooms` registry. All changes go through
+the room's lock and carry the room version the session was looking at: if
+anything happened in between (another team's bid landed first, the lot was
+sold), the action is rejected as stale instead of being applied to a state
+the bidder never saw. Sessions waiting on a room block on a condition
+variable and wake the moment its version moves, rather than polling.
+
+Bidder sessions check in with a heartbeat while their page is open. One
+that has not been heard from for `BIDDER_TIMEOUT` seconds is taken to have
+gone, so the auctioneer's page stops holding itself open for it.
+"""
+import threading
+import time
+
+from auction_engine import AuctionError
+
+BIDDER_TIMEOUT = 5.0  # seconds
+
+
+class StaleActionError(AuctionError):
+    """Raised when an action was based on a room version that is no longer current."""
+
+
+class AuctionRoom:
+    def __init__(self, engine, journal=None):
+        self.engine = engine
+        self.journal = journal
+        self.version = 0  # Bumped on every engine event; sessions send back the version they acted on
+        self._bidders = {}  # Team id -> when a bidder session for it last checked in
+        self._changed = threading.Condition(threading.Lock())
+        engine.subscribe(self._on_event)
+
+    @property
+    def id(self):
+        return self.engine.id
+
+    def _on_event(self, event):
+        # Events only fire from inside _act, so the lock is already held here
+        self.version += 1
+        self._changed.notify_all()
+
+    def _act(self, seen_version, action, *args):
+        with self._changed:
+            if seen_version != self.version:
+                raise StaleActionError("The auction moved on before this action arrived")
+            return action(*args)
+
+    def bid(self, team_id, seen_version):
+        return self._act(seen_version, self.engine.place_bid, team_id)
+
+    def hammer(self, seen_version):
+        return self._act(seen_version, self.engine.hammer)
+
+    def pass_lot(self, seen_version):
+        return self._act(seen_version, self.engine.pass_lot)
+
+    def set_proxy(self, team_id, max_bid, player_id):
+        """Register a max bid on the lot for `player_id`.
+
+        A limit does not depend on the price it was set at, so only a change
+        of lot makes it stale, not the bids in between.
+        """
+        with self._changed:
+            player = self.engine.current_player
+            if player is None or player.id != player_id:
+                raise StaleActionError("That lot closed before the max bid arrived")
+            return self.engine.set_proxy(team_id, max_bid)
+
+    def next_lot(self):
+        """Open the next lot unless one is open or the auction is over; returns the current player."""
+        with self._changed:
+            if self.engine.is_complete():
+                return None
+            return self.engine.next_lot()
+
+    def claim(self, team_id):
+        self.engine.team(team_id)  # Raises AuctionError for teams not in this auction
+        self.heartbeat(team_id)
+
+    def heartbeat(self, team_id):
+        """Note that a bidder session for `team_id` is still open."""
+        with self._changed:
+            self._bidders[team_id] = time.monotonic()
+
+    def live_bidders(self):
+        """Team ids with a bidder session heard from in the last `BIDDER_TIMEOUT` seconds."""
+        cutoff = time.monotonic() - BIDDER_TIMEOUT
+        with self._changed:
+            for team_id in [t for t, seen in self._bidders.items() if seen < cutoff]:
+                del self._bidders[team_id]
+            return list(self._bidders)
+
+    def wait(self, seen_version, timeout=None):
+        """Block until the room version differs from `seen_version` or `timeout` passes.
+
+        Returns the current version.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != seen_version, timeout)
+            return self.version
+
+    def finish(self):
+        """Mark the journal complete once the auction is over."""
+        with self._changed:
+            if self.journal is not None:
+                self.journal.mark_complete()
+                self.journal.close()
+                self.journal = None
+
+
+class RoomRegistry:
+    def __init__(self):
+        self._rooms = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rooms)
+
+    def __contains__(self, auction_id):
+        return auction_id in self._rooms
+
+    def get(self, auction_id):
+        return self._rooms.get(auction_id)
+
+    def open(self, engine, journal=None):
+        with self._lock:
+            if engine.id in self._rooms:
+                raise AuctionError(f"Auction {engine.id} already has a room")
+            room = self._rooms[engine.id] = AuctionRoom(engine, journal)
+            return room
+
+    def get_or_open(self, auction_id, load):
+        """Return the live room for `auction_id`, or open one from `load()` -> (engine, journal).
+
+        Loading happens under the registry lock, so two sessions resuming the
+        same auction never end up appending to one journal from two engines.
+        """
+        with self._lock:
+            room = self._rooms.get(auction_id)
+            if room is None:
+                engine, journal = load()
+                room = self._rooms[auction_id] = AuctionRoom(engine, journal)
+            return room
+
+    def close(self, auction_id):
+        with self._lock:
+            room = self._rooms.pop(auction_id, None)
+        if room is not None:
+            room.finish()
+        return room
+
+
+rooms = RoomRegistry()
@@ -0,0 +1,278 @@
+"""Monte Carlo auction simulation with automated bidders.
+
+Runs many complete auctions headlessly on `AuctionEngine`, with each team
+driven by a bidding `Strategy`, and aggregates the outcomes: price per role,
+unsold rate, purse left over and squad completion. Runs are spread over a
+process pool; every run gets its own seed derived from the batch seed, so
+results do not depend on the number of workers. Workers are spawned rather
+than forked, since forking a multi-threaded process such as the Streamlit
+server can leave a child deadlocked on a lock some other thread held.
+
+    python -m simulator --runs 2000 --teams 8 --purse 90 --squad-size 15
+"""
+import argparse
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from auction_engine import INCREMENT_LADDER, AuctionEngine
+from players import PLAYER_ROLES, generate_sample_players
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+class Strategy:
+    """How an automated team values players and how far it will bid.
+
+    `valuations` is called once per auction with the whole pool and should
+    be vectorized; `max_bid` is called once per lot and may adjust the
+    valuation for the team's current situation.
+    """
+
+    name = 'strategy'
+
+    def valuations(self, players, rng):
+        return players.column('base_price').copy()
+
+    def max_bid(self, engine, team, player, value):
+        return value
+
+
+class ValueBidder(Strategy):
+    """Values players by base price scaled up by a role-aware stat score."""
+
+    name = 'value'
+
+    def __init__(self, aggression=1.0, noise=0.15):
+        self.aggression = aggression
+        self.noise = noise
+
+    def valuations(self, players, rng):
+        role = players.column('role')
+        batting = np.nan_to_num(players.column('batting_avg'), nan=20.0)
+        bowling = np.nan_to_num(players.column('bowling_avg'), nan=40.0)
+        matches = players.column('matches_played')
+
+        # Scores in roughly [0, 1]: higher batting averages and lower bowling averages are better
+        bat_score = np.clip((batting - 20) / 40, 0, 1)
+        bowl_score = np.clip((40 - bowling) / 22, 0, 1)
+        roles = {name: players.role_code(name) for name in PLAYER_ROLES}
+        score = np.select(
+            [role == roles['Batsman'], role == roles['Bowler'], role == roles['All-rounder']],
+            [bat_score, bowl_score, (bat_score + bowl_score) / 2],
+            default=bat_score * 0.8 + 0.2,  # Wicket-keepers
+        )
+        experience = np.clip(matches / 200, 0, 1) * 0.5 + 0.75
+
+        value = players.column('base_price') * (1 + self.aggression * score * 2) * experience
+        if self.noise:
+            value = value * rng.lognormal(0, self.noise, size=len(value))
+        return value
+
+
+class RoleNeedBidder(ValueBidder):
+    """Pays a premium for roles the squad is still short of and backs off once a role is covered."""
+
+    name = 'role_need'
+
+    # Share of the squad each role should fill
+    DEFAULT_MIX = {'Batsman': 0.35, 'Bowler': 0.35, 'All-rounder': 0.2, 'Wicket-keeper': 0.1}
+
+    def __init__(self, aggression=1.0, noise=0.15, premium=0.5, mix=None):
+        super().__init__(aggression, noise)
+        self.premium = premium
+        self.mix = mix or self.DEFAULT_MIX
+
+    def max_bid(self, engine, team, player, value):
+        role = player.role
+        have = engine.ledger.roles_by_team[team['id']][role]
+        target = self.mix.get(role, 0) * engine.max_squad_size
+        return value * (1 + self.premium) if have < target else value * (1 - self.premium / 2)
+
+
+class BudgetPacer(ValueBidder):
+    """Never commits more than a fixed multiple of its per-slot budget to one player."""
+
+    name = 'budget_pacer'
+
+    def __init__(self, aggression=1.0, noise=0.15, stretch=2.0):
+        super().__init__(aggression, noise)
+        self.stretch = stretch
+
+    def max_bid(self, engine, team, player, value):
+        open_slots = max(1, engine.max_squad_size - len(team['players']))
+        return min(value, team['purse'] / open_slots * self.stretch)
+
+
+DEFAULT_STRATEGIES = [ValueBidder(), RoleNeedBidder(), BudgetPacer()]
+
+
+def run_auction(spec, seed):
+    """Run one complete auction and return its raw outcome."""
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+
+    if spec.get('players') is not None:
+        players = spec['players'].copy()
+    else:
+        players = generate_sample_players(spec['player_count'], rng=rng)
+
+    teams = []
+    for i, (name, purse) in enumerate(spec['teams']):
+        teams.append({
+            'id': i,
+            'name': name,
+            'purse': purse,
+            'original_purse': purse,
+            'players': [],
+            'can_bid': True
+        })
+    strategies = [spec['strategies'][i % len(spec['strategies'])] for i in range(len(teams))]
+    values = [strategy.valuations(players, np_rng) for strategy in strategies]
+
+    engine = AuctionEngine(teams, players, max_squad_size=spec['max_squad_size'], rng=rng, ladder=spec['ladder'],
+                           rules=spec.get('rules'))
+    lots = passed = 0
+    while not engine.is_complete():
+        player = engine.next_lot()
+        limits = {
+            team['id']: strategies[team['id']].max_bid(engine, team, player, values[team['id']][player.id])
+            for team in engine.eligible_teams()
+        }
+        while True:
+            price = engine.next_bid_amount()
+            bidders = [team_id for team_id, limit in limits.items()
+                       if team_id != engine.current_team and limit >= price and engine.can_bid(team_id)]
+            if not bidders:
+                break
+            engine.place_bid(rng.choice(bidders))
+        if engine.current_team is not None:
+            engine.hammer()
+        else:
+            engine.pass_lot()
+            passed += 1
+        lots += 1
+
+    sold = players.column('status') == 1
+    return {
+        'sold_roles': players.column('role')[sold],
+        'sold_prices': players.column('sold_price')[sold],
+        'unsold_rate': passed / lots if lots else 0.0,
+        'purse_left': np.array([t['purse'] for t in teams]),
+        'squad_completion': np.array([len(t['players']) / spec['max_squad_size'] for t in teams]),
+        'spent': np.array([t['original_purse'] - t['purse'] for t in teams]),
+        'strategies': [s.name for s in strategies],
+    }
+
+
+def _run_batch(spec, seeds):
+    return [run_auction(spec, seed) for seed in seeds]
+
+
+def run_seeds(runs, seed):
+    """Independent per-run seeds; the same (runs, seed) always gives the same list."""
+    return [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(runs)]
+
+
+def simulate(runs, teams, max_squad_size=15, players=None, player_count=100, strategies=None,
+             ladder=INCREMENT_LADDER, seed=0, workers=None, batch_size=None, rules=None):
+    """Run `runs` auctions and return aggregated distributions.
+
+    `teams` is a list of (name, purse) pairs. `players` is a `PlayerStore`
+    shared by every run; without it each run draws its own sample pool of
+    `player_count` players. Strategies are assigned to teams round-robin.
+    `workers` defaults to the CPU count; 1 runs everything in-process.
+    `rules` (a `SquadRules`) overrides `max_squad_size` with a full set of squad rules.
+    """
+    if rules is not None:
+        max_squad_size = rules.max_squad_size
+    spec = {
+        'teams': list(teams),
+        'max_squad_size': max_squad_size,
+        'players': players,
+        'player_count': player_count,
+        'strategies': list(strategies or DEFAULT_STRATEGIES),
+        'ladder': ladder,
+        'rules': rules,
+    }
+    seeds = run_seeds(runs, seed)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        outcomes = _run_batch(spec, seeds)
+    else:
+        # A few batches per worker keeps the pool busy without paying pickling costs per run
+        batch_size = batch_size or max(1, runs // (workers * 4))
+        batches = [seeds[i:i + batch_size] for i in range(0, runs, batch_size)]
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            outcomes = [o for batch in pool.map(_run_batch, [spec] * len(batches), batches) for o in batch]
+
+    return aggregate(outcomes, spec)
+
+
+def summarize(values):
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return {'count': 0}
+    summary = {'count': int(len(values)), 'mean': float(values.mean())}
+    for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f'p{p}'] = float(value)
+    return summary
+
+
+def aggregate(outcomes, spec):
+    roles = np.concatenate([o['sold_roles'] for o in outcomes])
+    prices = np.concatenate([o['sold_prices'] for o in outcomes])
+    completion = np.concatenate([o['squad_completion'] for o in outcomes])
+    strategy_names = np.concatenate([o['strategies'] for o in outcomes])
+    spent = np.concatenate([o['spent'] for o in outcomes])
+
+    # Role codes are the same in every run: they come from the shared PLAYER_ROLES ordering
+    return {
+        'runs': len(outcomes),
+        'price_by_role': {role: summarize(prices[roles == code]) for code, role in enumerate(PLAYER_ROLES)},
+        'unsold_rate': summarize([o['unsold_rate'] for o in outcomes]),
+        'purse_left': summarize(np.concatenate([o['purse_left'] for o in outcomes])),
+        'squad_completion': summarize(completion),
+        'full_squad_rate': float((completion >= 1).mean()) if len(completion) else 0.0,
+        'by_strategy': {
+            name: {
+                'spent': summarize(spent[strategy_names == name]),
+                'squad_completion': summarize(completion[strategy_names == name]),
+            }
+            for name in dict.fromkeys(strategy_names)
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=1_000)
+    parser.add_argument('--teams', type=int, default=8)
+    parser.add_argument('--purse', type=float, default=90.0)
+    parser.add_argument('--squad-size', type=int, default=15)
+    parser.add_argument('--players', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    teams = [(f"Team {i+1}", args.purse) for i in range(args.teams)]
+    result = simulate(args.runs, teams, max_squad_size=args.squad_size, player_count=args.players,
+                      seed=args.seed, workers=args.workers)
+
+    print(f"{result['runs']} auctions, {args.teams} teams, {args.players} players, squad size {args.squad_size}")
+    print("Price per role (crores):")
+    for role, s in result['price_by_role'].items():
+        if s['count']:
+            print(f"  {role:<14} mean {s['mean']:6.2f}  median {s['p50']:6.2f}  p95 {s['p95']:6.2f}")
+    print(f"Unsold rate:      mean {result['unsold_rate']['mean']:.1%}")
+    print(f"Purse left:       mean ₹{result['purse_left']['mean']:.2f} crores")
+    print(f"Squad completion: mean {result['squad_completion']['mean']:.1%}, "
+          f"full squads {result['full_squad_rate']:.1%}")
+
+
+if __name__ == '__main__':
+    main()
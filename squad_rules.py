@@ -0,0 +1,136 @@
+"""Squad-building rules, and each team's standing against them.
+
+`SquadRules` describes a legal squad: its minimum and maximum size, a
+(minimum, maximum) quota per role and a cap on overseas players. A team may
+only spend what it can without being left unable to complete its squad, so
+it holds back a reserve - the cheapest winning bid in the pool - for every
+slot it still has to fill.
+
+`SquadStanding` follows one team. It changes only when the team buys a
+player, and at that point it works out how much the team may bid for each
+kind of player - (role, overseas) - so eligibility during bidding is a
+dictionary lookup rather than a scan of the squad.
+"""
+from collections import Counter
+
+from players import PLAYER_ROLES
+
+
+class SquadRulesError(ValueError):
+    """Raised when the squad rules contradict each other."""
+
+
+class SquadRules:
+    def __init__(self, max_squad_size=15, min_squad_size=0, role_quotas=None, max_overseas=None,
+                 home_country=None):
+        self.max_squad_size = max_squad_size
+        self.min_squad_size = min_squad_size
+        self.role_quotas = {role: (low, high) for role, (low, high) in (role_quotas or {}).items()}
+        self.max_overseas = max_overseas
+        self.home_country = home_country
+        self.roles = list(dict.fromkeys([*PLAYER_ROLES, *self.role_quotas]))
+        self._check()
+
+    def _check(self):
+        if self.min_squad_size > self.max_squad_size:
+            raise SquadRulesError(f"Minimum squad size {self.min_squad_size} is above the maximum {self.max_squad_size}")
+        for role, (low, high) in self.role_quotas.items():
+            if high is not None and low > high:
+                raise SquadRulesError(f"{role}: minimum {low} is above the maximum {high}")
+        if self.role_minimum > self.max_squad_size:
+            raise SquadRulesError(f"Role minimums add up to {self.role_minimum}, more than a squad of {self.max_squad_size}")
+        if self.max_overseas is not None and self.home_country is None:
+            raise SquadRulesError("An overseas limit needs a home country")
+
+    @property
+    def role_minimum(self):
+        return sum(low for low, _ in self.role_quotas.values())
+
+    def min_spend(self, reserve):
+        """Purse a team needs at the start to complete a legal squad when no player costs less than `reserve`."""
+        return round(max(self.min_squad_size, self.role_minimum) * reserve, 2)
+
+    def is_overseas(self, country):
+        return self.home_country is not None and country != self.home_country
+
+    def to_dict(self):
+        return {
+            'max_squad_size': self.max_squad_size,
+            'min_squad_size': self.min_squad_size,
+            'role_quotas': {role: list(quota) for role, quota in self.role_quotas.items()},
+            'max_overseas': self.max_overseas,
+            'home_country': self.home_country,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        data.pop('reserve_per_slot', None)  # Older journals saved a fixed reserve; it now comes from the pool
+        return cls(**data)
+
+
+class SquadStanding:
+    """One team's squad measured against the rules, with its bid limits worked out ahead of time.
+
+    `reserve` is held back for every slot still to fill: the least any
+    player in the pool can be won for.
+    """
+
+    def __init__(self, rules, purse, reserve):
+        self.rules = rules
+        self.reserve = reserve
+        self.size = 0
+        self.overseas = 0
+        self.roles = Counter()
+        self.update(purse)
+
+    def add(self, role, overseas, purse):
+        """Count a purchase; `purse` is what the team has left after paying for it."""
+        self.size += 1
+        self.roles[role] += 1
+        self.overseas += overseas
+        self.update(purse)
+
+    def update(self, purse):
+        self.purse = purse
+        self._unmet = sum(max(0, low - self.roles[role]) for role, (low, _) in self.rules.role_quotas.items())
+        self._overseas_full = self.rules.max_overseas is not None and self.overseas >= self.rules.max_overseas
+        self._free = self._limit(None)  # Shared by every role without a quota
+        self.limits = {}
+        for role in self.rules.roles:
+            self._add_limits(role)
+        self.best = max((limit for limit in self.limits.values() if limit is not None), default=None)
+
+    def limit(self, role, overseas):
+        """Most the team may pay for a player of this kind, or None if it may not buy one at all."""
+        try:
+            return self.limits[role, overseas]
+        except KeyError:
+            # A role the rules do not name, e.g. from an imported pool
+            self._add_limits(role)
+            return self.limits[role, overseas]
+
+    def _add_limits(self, role):
+        limit = self._limit(role) if role in self.rules.role_quotas else self._free
+        self.limits[role, False] = limit
+        self.limits[role, True] = None if self._overseas_full else limit
+
+    def _limit(self, role):
+        rules = self.rules
+        if self.size >= rules.max_squad_size:
+            return None
+        low, high = rules.role_quotas.get(role, (0, None))
+        count = self.roles[role]
+        if high is not None and count >= high:
+            return None
+        unmet = self._unmet - (count < low)
+        open_slots = rules.max_squad_size - self.size - 1
+        if open_slots < unmet:
+            return None  # Would leave too few slots for the roles still required
+        required = max(rules.min_squad_size - self.size - 1, unmet)
+        return round(self.purse - required * self.reserve, 2)
+
+    def needs(self):
+        """Role -> players still required to meet its minimum."""
+        return {role: low - self.roles[role] for role, (low, _) in self.rules.role_quotas.items()
+                if self.roles[role] < low}
@@ -0,0 +1,114 @@
+"""Recovering an auction from its journal gives back the auction as it was when it stopped."""
+import json
+import os
+import random
+import shutil
+
+from auction_engine import AuctionEngine
+from benchmarks.bench_engine import make_teams
+from journal import AuctionJournal, recover
+from players import generate_players
+
+
+def new_auction(root, seed=0, **options):
+    engine = AuctionEngine(make_teams(5, 60.0), generate_players(300, seed), max_squad_size=15,
+                           rng=random.Random(seed))
+    return engine, AuctionJournal.create(engine, root=str(root), **options)
+
+
+def play(engine, rng, lots):
+    """Run `lots` lots with proxies and bids by hand, leaving the last one open."""
+    team_ids = [t['id'] for t in engine.teams]
+    for lot in range(lots):
+        if engine.next_lot() is None:
+            return
+        for team_id in rng.sample(team_ids, 3):
+            if engine.team(team_id)['can_bid']:
+                engine.set_proxy(team_id, round(rng.uniform(0.5, 6), 2))
+        team_id = rng.choice(team_ids)
+        if rng.random() < 0.3 and engine.can_bid(team_id):
+            engine.place_bid(team_id)
+        if lot < lots - 1:
+            engine.hammer() if engine.current_team else engine.pass_lot()
+
+
+def assert_same_auction(recovered, live):
+    assert recovered.state() == live.state()
+    assert [(t['purse'], t['players'], t['can_bid']) for t in recovered.teams] == \
+           [(t['purse'], t['players'], t['can_bid']) for t in live.teams]
+    assert recovered.ledger.transactions == live.ledger.transactions
+    assert recovered.ledger.total_spent == live.ledger.total_spent
+
+
+def test_recover_replays_the_whole_journal(tmp_path):
+    live, journal = new_auction(tmp_path)
+    play(live, random.Random(1), 40)
+    journal.close()
+
+    recovered, reopened = recover(journal.directory)
+    reopened.close()
+    assert not os.path.exists(os.path.join(journal.directory, 'snapshot.json'))
+    assert_same_auction(recovered, live)
+    assert reopened.seq == journal.seq
+
+
+def test_recover_from_snapshot_replays_only_the_tail(tmp_path, monkeypatch):
+    live, journal = new_auction(tmp_path, snapshot_every=50)
+    play(live, random.Random(2), 40)
+    journal.close()
+    with open(os.path.join(journal.directory, 'snapshot.json')) as f:
+        snapshot_seq = json.load(f)['seq']
+    assert 0 < snapshot_seq < journal.seq
+
+    replayed = []
+    apply = AuctionEngine.apply
+    monkeypatch.setattr(AuctionEngine, 'apply', lambda self, event: (replayed.append(event['seq']), apply(self, event)))
+    recovered, reopened = recover(journal.directory)
+    reopened.close()
+    assert replayed == list(range(snapshot_seq + 1, journal.seq + 1))
+    assert_same_auction(recovered, live)
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    live, journal = new_auction(tmp_path, snapshot_every=50)
+    play(live, random.Random(3), 30)
+    journal.close()
+    path = os.path.join(journal.directory, 'journal.jsonl')
+    intact = os.path.getsize(path)
+    with open(path, 'ab') as f:
+        f.write(b'{"seq":%d,"type":"bid","te' % (journal.seq + 1))  # The write a crash cut short
+
+    recovered, reopened = recover(journal.directory)
+    assert_same_auction(recovered, live)
+    assert os.path.getsize(path) == intact
+
+    # New events follow on from the last complete one
+    team_id = next(t['id'] for t in recovered.teams if recovered.can_bid(t['id']))
+    recovered.place_bid(team_id)
+    reopened.close()
+    again, journal = recover(journal.directory)
+    journal.close()
+    assert_same_auction(again, recovered)
+
+
+def test_open_lot_with_proxies_is_restored(tmp_path):
+    for snapshot_every in (10**9, 7):  # From the journal alone, and from a snapshot taken mid-lot
+        live, journal = new_auction(tmp_path / str(snapshot_every), snapshot_every=snapshot_every)
+        play(live, random.Random(4), 25)
+        team_ids = [t['id'] for t in live.teams]
+        live.set_proxy(team_ids[0], 15.0)
+        live.set_proxy(team_ids[1], 12.0)
+        assert live.current_player is not None
+        # What a crash would leave on disk, recovered while the live auction carries on
+        copy = shutil.copytree(journal.directory, tmp_path / f"crashed-{snapshot_every}")
+
+        recovered, reopened = recover(str(copy))
+        assert_same_auction(recovered, live)
+        assert [recovered.proxy(t) for t in team_ids] == [live.proxy(t) for t in team_ids]
+
+        # The restored proxies answer the next bid just as the live ones do
+        bidder = next(t for t in team_ids if t != live.current_team and live.can_bid(t))
+        assert recovered.place_bid(bidder) == live.place_bid(bidder)
+        assert (recovered.current_team, recovered.current_bid) == (live.current_team, live.current_bid)
+        journal.close()
+        reopened.close()
@@ -0,0 +1,77 @@
+"""PlayerIndex queries, bounds and sorts against a plain scan, on pools with missing stats."""
+import numpy as np
+import pytest
+
+from player_index import RANGE_COLUMNS, PlayerIndex
+from players import PLAYER_COLUMNS, PlayerStore, generate_players
+
+
+def pool_with_missing_stats(count=2_000, missing=0.2, seed=0):
+    """A generated pool with a share of the batting and bowling averages blanked, as an import leaves them."""
+    generated = generate_players(count, seed)
+    columns = {name: generated.column(name).copy() for name in PLAYER_COLUMNS}
+    rng = np.random.default_rng(seed)
+    for column in ('batting_avg', 'bowling_avg'):
+        columns[column][rng.random(count) < missing] = np.nan
+    store = PlayerStore(count, roles=generated.roles, countries=generated.countries)
+    store.extend(*(columns[name] for name in PLAYER_COLUMNS))
+    return store
+
+
+def scan(store, roles=None, **ranges):
+    mask = np.ones(len(store), dtype=bool)
+    if roles is not None:
+        mask &= np.isin(store.column('role'), [store.roles.index(r) for r in roles])
+    for column, (low, high) in ranges.items():
+        values = store.column(column)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+    return np.flatnonzero(mask)
+
+
+def test_bounds_skip_missing_stats():
+    store = pool_with_missing_stats()
+    index = PlayerIndex(store)
+    for column in RANGE_COLUMNS:
+        values = store.column(column)
+        assert index.bounds(column) == (np.nanmin(values).item(), np.nanmax(values).item())
+
+
+def test_bounds_of_a_stat_nobody_has():
+    store = pool_with_missing_stats(missing=1.0)
+    index = PlayerIndex(store)
+    assert index.bounds('batting_avg') is None
+    assert index.bounds('bowling_avg') is None
+    assert index.bounds('base_price') is not None
+    assert len(index.query(batting_avg=(0, None))) == 0
+
+
+@pytest.mark.parametrize('filters', [
+    {'batting_avg': (40, None)},
+    {'batting_avg': (None, 25)},
+    {'bowling_avg': (20, 30)},
+    {'roles': ['Bowler'], 'bowling_avg': (None, 28)},
+    {'batting_avg': (30, None), 'bowling_avg': (25, None), 'matches_played': (50, None)},
+    {'base_price': (1.0, None), 'batting_avg': (None, 60)},
+])
+def test_query_leaves_out_missing_stats(filters):
+    store = pool_with_missing_stats()
+    ids = PlayerIndex(store).query(**filters)
+    assert np.array_equal(ids, scan(store, **filters))
+    for column in ('batting_avg', 'bowling_avg'):
+        if column in filters:
+            assert not np.isnan(store.column(column)[ids]).any()
+
+
+@pytest.mark.parametrize('share', [0.05, 1.0])  # Small selections are sorted directly, large ones walk the index
+@pytest.mark.parametrize('descending', [False, True])
+@pytest.mark.parametrize('column', ['batting_avg', 'bowling_avg', 'base_price'])
+def test_sort_puts_missing_stats_last(share, descending, column):
+    store = pool_with_missing_stats()
+    index = PlayerIndex(store)
+    ids = np.flatnonzero(np.random.default_rng(1).random(len(store)) < share).astype(np.int32)
+    values = store.column(column)
+    expected = sorted(ids, key=lambda i: (np.isnan(values[i]), -values[i] if descending else values[i], i))
+    assert index.sort(ids, column, descending).tolist() == [int(i) for i in expected]
@@ -0,0 +1,173 @@
+"""Proxy bids settled in closed form against the same bids placed one raise at a time."""
+import random
+
+import pytest
+
+from auction_engine import AuctionEngine, ladder_steps, next_bid
+from benchmarks.bench_engine import make_teams
+from players import generate_players
+from squad_rules import SquadRules
+
+RULES = {'max_squad_size': 6, 'min_squad_size': 4, 'role_quotas': {'Bowler': (1, 2), 'Wicket-keeper': (0, 1)},
+         'max_overseas': 2, 'home_country': 'India'}
+
+
+def step_through(engine, proxies):
+    """The reference resolver: one raise at a time, answered by the challenger with
+    the most raises left (then the highest limit, then the earliest registration)."""
+    while True:
+        best = None
+        for order, (team_id, max_bid) in enumerate(proxies.items()):
+            if team_id == engine.current_team or not engine.can_bid(team_id):
+                continue
+            limit = min(max_bid, engine.max_bid(team_id))
+            if engine.next_bid_amount() > limit:
+                continue
+            key = (ladder_steps(engine.current_bid, limit, engine.ladder), limit, -order)
+            if best is None or key > best[0]:
+                best = (key, team_id)
+        if best is None:
+            return
+        engine._bid(best[1], proxy=True)
+
+
+def new_engine(purses, rules=None, seed=0):
+    """An engine over a small pool with the first lot open."""
+    teams = make_teams(len(purses), 90.0)
+    for team, purse in zip(teams, purses):
+        team['purse'] = team['original_purse'] = purse
+    engine = AuctionEngine(teams, generate_players(40, seed), rules=SquadRules(**rules or {}), rng=random.Random(seed))
+    engine.next_lot()
+    return engine
+
+
+def twin_engines(seed, rules=None, purses=(0.6, 12.0), teams=4):
+    """The engine under test and a reference engine in the same state, with some players already sold."""
+    rng = random.Random(seed)
+    purse = [round(rng.uniform(*purses), 2) for _ in range(teams)]
+    engine, reference = new_engine(purse, rules, seed), new_engine(purse, rules, seed)
+    # Part-fill the squads so the rules cap some teams below their purse
+    for _ in range(rng.randint(0, 8)):
+        bidders = [t['id'] for t in engine.teams if engine.can_bid(t['id'])]
+        buyer = rng.choice(bidders) if bidders else None
+        for twin in (engine, reference):
+            if buyer is not None:
+                twin.place_bid(buyer)
+                twin.hammer()
+            else:
+                twin.pass_lot()
+            twin.next_lot()
+    return engine, reference, rng
+
+
+def record_bids(engine):
+    """List that fills with (team id, amount) for every bid placed from now on."""
+    bids = []
+    engine.subscribe(lambda event: bids.append((event['team'], event['amount'])) if event['type'] == 'bid' else None)
+    return bids
+
+
+def check_random_lot(seed, rules=None, limits=(0.5, 14.0)):
+    engine, reference, rng = twin_engines(seed, rules)
+    if engine.current_player is None:
+        return
+    team_ids = [t['id'] for t in engine.teams]
+    proxies = {}
+    for _ in range(rng.randint(1, 6)):
+        team_id = rng.choice(team_ids)
+        if rng.random() < 0.3:
+            # A bid by hand, which registered proxies answer at once
+            if engine.can_bid(team_id):
+                engine.place_bid(team_id)
+                reference._bid(team_id)
+        else:
+            max_bid = round(rng.uniform(*limits), 2)
+            if rng.random() < 0.3 and proxies:
+                max_bid = rng.choice(list(proxies.values()))  # The same limit as another team: a tie
+            engine.set_proxy(team_id, max_bid)
+            proxies.pop(team_id, None)  # Setting a max bid again counts as a new registration
+            proxies[team_id] = max_bid
+        step_through(reference, proxies)
+        assert (engine.current_team, engine.current_bid) == (reference.current_team, reference.current_bid)
+        assert engine.ledger.bid_count == reference.ledger.bid_count
+
+
+def test_ladder_steps_matches_stepping():
+    rng = random.Random(0)
+    for _ in range(5_000):
+        start = round(rng.choice([0.5, 0.75, 1.0, 1.5, 2.0]) + rng.randint(0, 40) * 0.05, 2)
+        limit = round(rng.uniform(0, 15), 2)
+        price, steps = start, 0
+        while next_bid(price) <= limit:
+            price = next_bid(price)
+            steps += 1
+        assert ladder_steps(start, limit) == steps
+
+
+@pytest.mark.parametrize('start', [0.5, 0.95, 1.0, 1.9, 4.8, 5.0, 7.25])
+def test_ladder_steps_across_bands(start):
+    price, steps = start, 0
+    while price <= 12:
+        assert ladder_steps(start, price) == steps
+        price = next_bid(price)
+        steps += 1
+
+
+def test_proxies_match_stepping():
+    for seed in range(1_500):
+        check_random_lot(seed)
+
+
+def test_proxies_match_stepping_under_squad_rules():
+    for seed in range(1_500):
+        check_random_lot(seed, RULES, limits=(0.5, 8.0))
+
+
+def test_tied_limits_alternate_up_to_the_limit():
+    engine = new_engine([50.0, 50.0, 50.0])
+    reference = new_engine([50.0, 50.0, 50.0])
+    first, second, third = (t['id'] for t in engine.teams)
+    proxies = {}
+    for team_id in (first, second, third):
+        engine.set_proxy(team_id, 5.0)
+        proxies[team_id] = 5.0
+        step_through(reference, proxies)
+    # Equal limits go raise for raise, and whichever lands on the limit keeps the lot
+    assert engine.current_bid == 5.0
+    assert (engine.current_team, engine.ledger.bid_count) == (reference.current_team, reference.ledger.bid_count)
+
+
+def test_manual_leader_without_proxy_is_outbid_once():
+    engine = new_engine([50.0, 50.0])
+    leader, challenger = engine.teams[0]['id'], engine.teams[1]['id']
+    engine.place_bid(leader)
+    price = engine.current_bid
+    engine.set_proxy(challenger, 20.0)
+    # The leader has no proxy to answer with, so one raise is enough
+    assert (engine.current_team, engine.current_bid) == (challenger, next_bid(price))
+
+
+def test_leader_keeps_lot_against_a_lower_limit():
+    engine = new_engine([50.0, 50.0])
+    leader, challenger = engine.teams[0]['id'], engine.teams[1]['id']
+    engine.set_proxy(leader, 6.0)
+    bids = record_bids(engine)
+    engine.set_proxy(challenger, 4.0)
+    # The challenger goes as far as it can, and the leader answers its last bid once
+    last_challenge = bids[-2][1]
+    assert bids[-2][0] == challenger and last_challenge <= 4.0 < next_bid(next_bid(last_challenge))
+    assert (engine.current_team, engine.current_bid) == (leader, next_bid(last_challenge))
+
+
+def test_squad_rules_cap_a_proxy():
+    engine = new_engine([10.0, 50.0], rules={'max_squad_size': 11, 'min_squad_size': 5})
+    capped, rival = engine.teams[0]['id'], engine.teams[1]['id']
+    allowed = engine.max_bid(capped)
+    assert allowed < 10.0
+    bids = record_bids(engine)
+    engine.set_proxy(rival, 20.0)
+    engine.set_proxy(capped, 10.0)
+    # The capped team stops at the rules' limit, not its max bid, and the rival answers that once
+    last_capped = max(amount for team_id, amount in bids if team_id == capped)
+    assert last_capped <= allowed < next_bid(next_bid(last_capped))
+    assert (engine.current_team, engine.current_bid) == (rival, next_bid(last_capped))